@@ -0,0 +1,200 @@
+"""
+Native asyncio HTTP client (aiohttp) for the Kubernetes API.
+
+pykube's HTTPClient is still used to build request URLs and to set up authentication
+(Bearer tokens, client certificates, exec plugins, ..), but the actual HTTP request
+is sent via a shared aiohttp ClientSession per API server, i.e. we get keep-alive connection pools
+per cluster and do not block a thread per request.
+
+Limitations compared to pykube's blocking client:
+
+* authentication and certificates are set up via pykube's (private) KubernetesHTTPAdapter methods
+* "tls-server-name" from kubeconfig is not supported
+* a 401 response to a WATCH request is not retried (the caller has to retry)
+"""
+import asyncio
+import json
+import ssl
+from functools import partial
+from typing import Dict
+from typing import Tuple
+
+import aiohttp
+import requests
+from pykube.http import KubernetesHTTPAdapter
+from yarl import URL
+
+# maximum number of concurrent connections per API server
+CONNECTION_LIMIT_PER_HOST = 20
+KEEPALIVE_TIMEOUT = 60
+
+_sessions: Dict[Tuple, aiohttp.ClientSession] = {}
+
+
+class Response:
+
+    """Minimal subset of requests.Response, i.e. our callers can treat both clients the same."""
+
+    def __init__(self, url: str, status_code: int, headers, content: bytes):
+        self.url = url
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+
+    @property
+    def ok(self):
+        return self.status_code < 400
+
+    @property
+    def text(self):
+        return self.content.decode("utf-8")
+
+    def json(self):
+        return json.loads(self.content)
+
+    def raise_for_status(self):
+        if not self.ok:
+            raise requests.exceptions.HTTPError(
+                f"{self.status_code} Error for url: {self.url}", response=self
+            )
+
+
+def _requires_blocking_auth(api) -> bool:
+    """Return whether preparing a request might block (e.g. running an "exec" auth plugin)."""
+    user = api.config.user
+    return "exec" in user or "auth-provider" in user
+
+
+def prepare_request(api, **kwargs):
+    """Build URL, headers and TLS settings for a GET request using pykube's auth setup.
+
+    Return the prepared request, TLS settings, timeout, and pykube's optional retry function
+    which refreshes the auth provider's token (e.g. GCP) and sends the request again.
+    """
+    kwargs = api.get_kwargs(**kwargs)
+    session = api.session
+    request = requests.Request(
+        "GET",
+        kwargs["url"],
+        headers=kwargs.get("headers"),
+        params=kwargs.get("params"),
+        auth=kwargs.get("auth"),
+    )
+    prepared = session.prepare_request(request)
+    send_kwargs = {"verify": session.verify, "cert": session.cert}
+    adapter = session.get_adapter(prepared.url)
+    retry_func = None
+    if isinstance(adapter, KubernetesHTTPAdapter):
+        retry_func = adapter._setup_request_auth(
+            adapter.kube_config, prepared, send_kwargs
+        )
+        adapter._setup_request_certificates(adapter.kube_config, prepared, send_kwargs)
+    send_kwargs["timeout"] = kwargs["timeout"]
+    return prepared, send_kwargs, retry_func
+
+
+def _create_ssl_context(verify, cert):
+    if verify is False:
+        return False
+    context = ssl.create_default_context(
+        cafile=verify if isinstance(verify, str) else None
+    )
+    if cert:
+        if isinstance(cert, str):
+            context.load_cert_chain(cert)
+        else:
+            context.load_cert_chain(*cert)
+    return context
+
+
+def get_session(url: str, verify, cert) -> aiohttp.ClientSession:
+    """Return the shared ClientSession (connection pool) for the given API server and TLS settings."""
+    parsed = URL(url)
+    key = (parsed.origin(), verify, cert)
+    session = _sessions.get(key)
+    if session is None or session.closed:
+        connector = aiohttp.TCPConnector(
+            ssl=_create_ssl_context(verify, cert),
+            limit_per_host=CONNECTION_LIMIT_PER_HOST,
+            keepalive_timeout=KEEPALIVE_TIMEOUT,
+        )
+        session = aiohttp.ClientSession(connector=connector, auto_decompress=True)
+        _sessions[key] = session
+    return session
+
+
+def get_client_timeout(timeout) -> aiohttp.ClientTimeout:
+    """Convert requests' timeout (seconds or a (connect, read) tuple) to aiohttp's ClientTimeout."""
+    # requests' timeout applies to connect and read (not the total request duration)
+    if isinstance(timeout, tuple):
+        connect_timeout, read_timeout = timeout
+    else:
+        connect_timeout = read_timeout = timeout
+    return aiohttp.ClientTimeout(sock_connect=connect_timeout, sock_read=read_timeout)
+
+
+async def _run_in_thread_pool(func, *args):
+    # the kubernetes module imports this module, i.e. we cannot import it at the top
+    from kube_web.kubernetes import thread_pool
+
+    loop = asyncio.get_event_loop()
+    return await loop.run_in_executor(thread_pool, func, *args)
+
+
+async def _prepare(api, kwargs):
+    if _requires_blocking_auth(api):
+        return await _run_in_thread_pool(partial(prepare_request, api, **kwargs))
+    return prepare_request(api, **kwargs)
+
+
+async def get(api, **kwargs) -> Response:
+    """Execute HTTP GET against the Kubernetes API (same arguments as pykube's HTTPClient.get)."""
+    prepared, send_kwargs, retry_func = await _prepare(api, kwargs)
+    session = get_session(prepared.url, send_kwargs["verify"], send_kwargs["cert"])
+    async with session.get(
+        URL(prepared.url, encoded=True),
+        headers=dict(prepared.headers),
+        timeout=get_client_timeout(send_kwargs["timeout"]),
+    ) as response:
+        content = await response.read()
+        status = response.status
+        headers = response.headers
+    if status == 401 and retry_func:
+        # same as pykube's KubernetesHTTPAdapter.send: refresh the token and retry (blocking)
+        send_kwargs["_retry_attempt"] = 1
+        return await _run_in_thread_pool(partial(retry_func, send_kwargs=send_kwargs))
+    return Response(prepared.url, status, headers, content)
+
+
+async def stream_lines(api, **kwargs):
+    """Execute HTTP GET and yield the response body line by line (e.g. for WATCH requests)."""
+    prepared, send_kwargs, _ = await _prepare(api, kwargs)
+    session = get_session(prepared.url, send_kwargs["verify"], send_kwargs["cert"])
+    async with session.get(
+        URL(prepared.url, encoded=True),
+        headers=dict(prepared.headers),
+        timeout=get_client_timeout(send_kwargs["timeout"]),
+    ) as response:
+        if response.status >= 400:
+            content = await response.read()
+            Response(
+                prepared.url, response.status, response.headers, content
+            ).raise_for_status()
+        # note: we don't use response.content.readline() as it limits the line length
+        buffer = b""
+        async for chunk in response.content.iter_any():
+            buffer += chunk
+            *lines, buffer = buffer.split(b"\n")
+            for line in lines:
+                if line.strip():
+                    yield line
+        if buffer.strip():
+            yield buffer
+
+
+async def close():
+    """Close all connection pools (on application shutdown)."""
+    sessions = list(_sessions.values())
+    _sessions.clear()
+    for session in sessions:
+        await session.close()
@@ -0,0 +1,79 @@
+import asyncio
+import hashlib
+import logging
+import time
+from typing import Any
+from typing import Dict
+from typing import Hashable
+from typing import Optional
+from typing import Set
+from typing import Tuple
+
+logger = logging.getLogger(__name__)
+
+
+def get_token_key(token: Optional[str]) -> Optional[str]:
+    """Return a hash of the access token to use in cache keys (never keep or log the token itself)."""
+    if token is None:
+        return None
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+
+class TTLCache:
+
+    """
+    Cache results of async functions for a limited time (TTL).
+
+    Entries older than the TTL are still returned for another "stale" period,
+    but are refreshed in the background (stale-while-revalidate).
+    """
+
+    def __init__(
+        self, ttl: float, stale_ttl: float = 0, max_size: int = 1000, name: str = ""
+    ):
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.max_size = max_size
+        # only used for logging, cache keys might contain sensitive data
+        self.name = name
+        self._entries: Dict[Hashable, Tuple[float, Any]] = {}
+        self._refreshing: Set[Hashable] = set()
+        # the event loop only keeps weak references to tasks
+        self._refresh_tasks: Set[asyncio.Task] = set()
+
+    def _set(self, key, value):
+        self._entries.pop(key, None)
+        self._entries[key] = (time.monotonic(), value)
+        while len(self._entries) > self.max_size:
+            # evict the oldest entry (dicts preserve insertion order)
+            del self._entries[next(iter(self._entries))]
+
+    async def _refresh(self, key, func):
+        try:
+            self._set(key, await func())
+        except Exception as e:
+            logger.warning(f"Failed to refresh {self.name} cache entry: {e}")
+        finally:
+            self._refreshing.discard(key)
+
+    async def get(self, key: Hashable, func):
+        """Return cached value for key or call func() to get it."""
+        entry = self._entries.get(key)
+        if entry:
+            timestamp, value = entry
+            age = time.monotonic() - timestamp
+            if age < self.ttl:
+                return value
+            if age < self.ttl + self.stale_ttl:
+                if key not in self._refreshing:
+                    self._refreshing.add(key)
+                    task = asyncio.create_task(self._refresh(key, func))
+                    self._refresh_tasks.add(task)
+                    task.add_done_callback(self._refresh_tasks.discard)
+                return value
+        value = await func()
+        self._set(key, value)
+        return value
+
+    def invalidate(self, key: Hashable):
+        self._entries.pop(key, None)
@@ -1,7 +1,13 @@
+import json
 import logging
+import os
+import threading
 import time
 from pathlib import Path
+from typing import Dict
 from typing import List
+from typing import Optional
+from typing import Tuple
 from urllib.parse import urljoin
 
 import requests
@@ -17,16 +23,45 @@ class OAuth2BearerTokenAuth(AuthBase):
 
     """Dynamic authentication loading OAuth Bearer token from file (potentially mounted from a Kubernetes secret)."""
 
+    # check the token file for changes at most every N seconds
+    CHECK_INTERVAL_SECONDS = 10
+
     def __init__(self, token_path: Path):
         self.token_path = token_path
+        self._lock = threading.Lock()
+        self._token: Optional[str] = None
+        self._file_stat: Optional[Tuple[int, int, int]] = None
+        self._last_check = 0.0
+
+    def _is_fresh(self, now: float) -> bool:
+        return (
+            self._token is not None
+            and now - self._last_check < self.CHECK_INTERVAL_SECONDS
+        )
+
+    def get_token(self) -> str:
+        now = time.monotonic()
+        if self._is_fresh(now):
+            return self._token
+        # requests are sent from multiple threads
+        with self._lock:
+            if self._is_fresh(now):
+                return self._token
+            # stat() follows symlinks, i.e. we notice Kubernetes secret updates (atomic symlink swap)
+            stat = self.token_path.stat()
+            file_stat = (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+            if file_stat != self._file_stat:
+                with self.token_path.open() as fd:
+                    self._token = fd.read().strip()
+                self._file_stat = file_stat
+            self._last_check = now
+            return self._token
 
     def __call__(self, request):
         if "Authorization" in request.headers:
             # do not overwrite any existing Authorization header
             return request
-        with self.token_path.open() as fd:
-            token = fd.read().strip()
-        request.headers["Authorization"] = f"Bearer {token}"
+        request.headers["Authorization"] = f"Bearer {self.get_token()}"
         return request
 
 
@@ -98,15 +133,22 @@ class ClusterRegistryDiscoverer:
                 urljoin(self._url, "/kubernetes-clusters"), timeout=10
             )
             response.raise_for_status()
+            # keep HTTP clients (and their connection pools) of unchanged clusters
+            previous_clients = {
+                (cluster.name, cluster.api.url): cluster.api
+                for cluster in self._clusters
+            }
             clusters = []
             for row in response.json()["items"]:
                 # only consider "ready" clusters
                 if row.get("lifecycle_status", "ready") == "ready":
-                    config = KubeConfig.from_url(row["api_server_url"])
-                    client = HTTPClient(config)
-                    client.session.auth = OAuth2BearerTokenAuth(
-                        self._oauth2_bearer_token_path
-                    )
+                    client = previous_clients.get((row["alias"], row["api_server_url"]))
+                    if not client:
+                        config = KubeConfig.from_url(row["api_server_url"])
+                        client = HTTPClient(config)
+                        client.session.auth = OAuth2BearerTokenAuth(
+                            self._oauth2_bearer_token_path
+                        )
                     labels = {}
                     for key in (
                         "id",
@@ -130,24 +172,66 @@ class ClusterRegistryDiscoverer:
         return self._clusters
 
 
+def _get_context_fingerprint(doc: dict, context: str) -> str:
+    """Return string representing the complete kubeconfig of one context (incl. cluster and user)."""
+    context_spec = {}
+    for entry in doc.get("contexts") or []:
+        if entry["name"] == context:
+            context_spec = entry.get("context") or {}
+    clusters = [
+        entry
+        for entry in doc.get("clusters") or []
+        if entry["name"] == context_spec.get("cluster")
+    ]
+    users = [
+        entry
+        for entry in doc.get("users") or []
+        if entry["name"] == context_spec.get("user")
+    ]
+    return json.dumps([context_spec, clusters, users], sort_keys=True, default=str)
+
+
 class KubeconfigDiscoverer:
     def __init__(self, kubeconfig_path: Path, contexts: set):
         self._path = kubeconfig_path
         self._contexts = contexts
+        self._file_stat: Optional[Tuple[int, int, int]] = None
+        # context name -> (fingerprint, Cluster)
+        self._clusters: Dict[str, Tuple[str, Cluster]] = {}
 
     def get_clusters(self):
+        # same default as KubeConfig.from_file
+        path = Path(
+            str(self._path) if self._path else os.getenv("KUBECONFIG", "~/.kube/config")
+        ).expanduser()
+        try:
+            stat = path.stat()
+            file_stat = (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+        except OSError:
+            file_stat = None
+        if file_stat and file_stat == self._file_stat:
+            # kubeconfig file did not change
+            return [cluster for _, cluster in self._clusters.values()]
+
         # Kubernetes Python client expects "vintage" string path
         config_file = str(self._path) if self._path else None
         config = KubeConfig.from_file(config_file)
+        clusters = {}
         for context in config.contexts:
             if self._contexts and context not in self._contexts:
                 # filter out
                 continue
-            # create a new KubeConfig with new "current context"
-            context_config = KubeConfig(config.doc, context)
-            client = HTTPClient(context_config)
-            cluster = Cluster(context, client)
-            yield cluster
+            fingerprint = _get_context_fingerprint(config.doc, context)
+            previous_fingerprint, cluster = self._clusters.get(context, (None, None))
+            if fingerprint != previous_fingerprint:
+                # create a new KubeConfig with new "current context"
+                context_config = KubeConfig(config.doc, context)
+                client = HTTPClient(context_config)
+                cluster = Cluster(context, client)
+            clusters[context] = (fingerprint, cluster)
+        self._clusters = clusters
+        self._file_stat = file_stat
+        return [cluster for _, cluster in clusters.values()]
 
 
 class MockDiscoverer:
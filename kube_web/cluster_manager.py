@@ -1,9 +1,11 @@
 import re
+import time
 from pathlib import Path
 from typing import Dict
 from typing import List
 
 from .cluster_discovery import OAuth2BearerTokenAuth
+from .informer import InformerCache
 from .resource_registry import ResourceRegistry
 from .selector import selector_matches
 
@@ -23,12 +25,14 @@ class Cluster:
         labels: dict,
         spec: dict,
         resource_registry: ResourceRegistry,
+        informer_cache: InformerCache,
     ):
         self.name = name
         self.api = api
         self.labels = labels or {}
         self.spec = spec or {}
         self.resource_registry = resource_registry
+        self.informer_cache = informer_cache
 
 
 class ClusterNotFound(Exception):
@@ -43,48 +47,86 @@ class ClusterManager:
         selector: dict,
         cluster_auth_token_path: Path,
         preferred_api_versions: dict,
+        informer_resource_types: frozenset = frozenset(),
+        api_discovery_cache_path: Path = None,
+        api_discovery_refresh_interval: float = 0,
+        reload_interval: float = 0,
+        connect_timeout: float = 0,
     ):
         self._clusters: Dict[str, Cluster] = {}
         self.discoverer = discoverer
         self.selector = selector
         self.cluster_auth_token_path = cluster_auth_token_path
         self.preferred_api_versions = preferred_api_versions
+        self.informer_resource_types = informer_resource_types
+        self.api_discovery_cache_path = api_discovery_cache_path
+        self.api_discovery_refresh_interval = api_discovery_refresh_interval
+        self.reload_interval = reload_interval
+        self.connect_timeout = connect_timeout
+        self._last_reload = 0.0
         self.reload()
 
     def reload(self):
         _clusters = {}
         for cluster in self.discoverer.get_clusters():
             if selector_matches(self.selector, cluster.labels):
+                # the cluster name might contain invalid characters,
+                # e.g. KubeConfig context names can contain slashes
+                sanitized_name = sanitize_cluster_name(cluster.name)
+                previous_cluster = self._clusters.get(sanitized_name)
+                if previous_cluster and previous_cluster.api is cluster.api:
+                    # unchanged cluster: keep the HTTP client (connection pool) and all caches
+                    previous_cluster.labels = cluster.labels or {}
+                    previous_cluster.spec = cluster.spec or {}
+                    _clusters[sanitized_name] = previous_cluster
+                    continue
                 if self.cluster_auth_token_path:
                     # overwrite auth mechanism with dynamic access token (loaded from file)
                     cluster.api.session.auth = OAuth2BearerTokenAuth(
                         self.cluster_auth_token_path
                     )
-                # the cluster name might contain invalid characters,
-                # e.g. KubeConfig context names can contain slashes
-                sanitized_name = sanitize_cluster_name(cluster.name)
-                previous_cluster = self._clusters.get(sanitized_name)
+                if self.connect_timeout and not isinstance(cluster.api.timeout, tuple):
+                    # fail fast for unreachable API servers, but keep the read timeout
+                    cluster.api.timeout = (self.connect_timeout, cluster.api.timeout)
                 if previous_cluster:
                     # the Resource Registry (registered APIs, CRDs, ..) takes a long time to load,
-                    # we therefore want to keep the information even when reloading the cluster list
+                    # we therefore want to keep the information even when the cluster config changed
                     resource_registry = previous_cluster.resource_registry
+                    resource_registry.api = cluster.api
+                    # informers need to watch with the new config
+                    previous_cluster.informer_cache.stop()
                 else:
                     resource_registry = ResourceRegistry(
-                        cluster.api, self.preferred_api_versions
+                        cluster.api,
+                        self.preferred_api_versions,
+                        self.api_discovery_cache_path,
+                        self.api_discovery_refresh_interval,
                     )
+                informer_cache = InformerCache(
+                    sanitized_name, cluster.api, self.informer_resource_types
+                )
                 _clusters[sanitized_name] = Cluster(
                     sanitized_name,
                     cluster.api,
                     cluster.labels,
                     cluster.spec,
                     resource_registry,
+                    informer_cache,
                 )
 
+        for name, cluster in self._clusters.items():
+            if name not in _clusters:
+                # cluster was removed
+                cluster.informer_cache.stop()
+                cluster.resource_registry.stop()
+
         self._clusters = _clusters
+        self._last_reload = time.monotonic()
 
     @property
     def clusters(self) -> List[Cluster]:
-        self.reload()
+        if time.monotonic() - self._last_reload >= self.reload_interval:
+            self.reload()
         return list(self._clusters.values())
 
     def get(self, cluster: str) -> Cluster:
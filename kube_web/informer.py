@@ -0,0 +1,237 @@
+"""
+In-memory informer cache for frequently listed resource types.
+
+An informer does one LIST (as Table with full objects) and then keeps its copy up-to-date via WATCH,
+i.e. list views, search, and joins can be served from memory instead of doing a LIST per request.
+"""
+import asyncio
+import logging
+import re
+from typing import Dict
+from typing import Optional
+from typing import Tuple
+
+import pykube
+from pykube.objects import NamespacedAPIObject
+from pykube.query import everything
+from pykube.query import Query
+from pykube.query import Table
+
+from kube_web import kubernetes
+from kube_web.selector import parse_selector
+from kube_web.selector import selector_matches
+
+logger = logging.getLogger(__name__)
+
+RETRY_DELAY_SECONDS = 10
+
+# we can only evaluate simple equality-based label selectors in memory
+SIMPLE_SELECTOR_CONDITION_PATTERN = re.compile(r"^\s*[\w./-]+\s*!?=\s*[\w./-]*\s*$")
+
+
+def parse_simple_selector(selector) -> Optional[dict]:
+    """Parse label selector into a dict usable with selector_matches or return None if not supported."""
+    if selector is everything or not selector:
+        return {}
+    if isinstance(selector, dict):
+        if any("__" in key for key in selector.keys()):
+            # pykube's operator syntax (e.g. "app__in")
+            return None
+        return selector
+    for condition in selector.split(","):
+        if not SIMPLE_SELECTOR_CONDITION_PATTERN.match(condition):
+            return None
+    return parse_selector(selector)
+
+
+def _row_key(row) -> Tuple[Optional[str], str]:
+    metadata = row["object"]["metadata"]
+    return (metadata.get("namespace"), metadata["name"])
+
+
+class Informer:
+    def __init__(self, cluster_name: str, api, api_obj_class):
+        self.cluster_name = cluster_name
+        self.api = api
+        self.api_obj_class = api_obj_class
+        self.columns: list = []
+        self.rows: Dict[Tuple[Optional[str], str], dict] = {}
+        self.synced = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    def __repr__(self):
+        return f"<Informer {self.api_obj_class.endpoint} in {self.cluster_name}>"
+
+    def start(self):
+        if not self._task:
+            self._task = asyncio.create_task(self.run())
+
+    def stop(self):
+        if self._task:
+            self._task.cancel()
+            self._task = None
+        self.synced.clear()
+
+    def _query(self):
+        query = self.api_obj_class.objects(self.api)
+        if issubclass(self.api_obj_class, NamespacedAPIObject):
+            query = query.filter(namespace=pykube.all)
+        return query
+
+    async def list(self) -> str:
+        table = await kubernetes.get_table(
+            self._query(), params={"includeObject": "Object"}
+        )
+        self.columns = table.columns
+        self.rows = {_row_key(row): row for row in table.rows or []}
+        self.synced.set()
+        logger.debug(f"{self} synced with {len(self.rows)} rows")
+        return table.obj["metadata"]["resourceVersion"]
+
+    async def watch(self, resource_version: str):
+        """Apply WATCH events to our rows until we need to LIST again."""
+        while True:
+            async for event in kubernetes.watch_table(
+                self._query(), resource_version, params={"includeObject": "Object"}
+            ):
+                event_type = event["type"]
+                obj = event["object"]
+                if event_type == "ERROR":
+                    # e.g. "410 Gone" if our resource version is too old
+                    logger.debug(f"{self} got watch error: {obj.get('message')}")
+                    return
+                if event_type == "BOOKMARK":
+                    resource_version = obj["metadata"]["resourceVersion"]
+                    continue
+                for row in obj.get("rows") or []:
+                    key = _row_key(row)
+                    if event_type == "DELETED":
+                        self.rows.pop(key, None)
+                    else:
+                        self.rows[key] = row
+                    resource_version = row["object"]["metadata"]["resourceVersion"]
+
+    async def run(self):
+        while True:
+            try:
+                resource_version = await self.list()
+                await self.watch(resource_version)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # e.g. we might not be allowed to list objects in all namespaces
+                logger.warning(f"{self} failed: {e}")
+                # do not serve stale data while we are not watching
+                self.synced.clear()
+                await asyncio.sleep(RETRY_DELAY_SECONDS)
+
+    def get_rows(self, namespace, selector: dict):
+        """Yield matching rows ordered by namespace and name (same order as a LIST from the API server)."""
+        # WATCH events add new objects at the end of our dict
+        for key in sorted(self.rows):
+            row = self.rows[key]
+            metadata = row["object"]["metadata"]
+            if namespace and metadata.get("namespace") != namespace:
+                continue
+            if selector and not selector_matches(selector, metadata.get("labels", {})):
+                continue
+            yield row
+
+
+class InformerCache:
+
+    """Informers of one cluster for the configured resource types (e.g. pods, nodes)."""
+
+    def __init__(self, cluster_name: str, api, resource_types: frozenset):
+        self.cluster_name = cluster_name
+        self.api = api
+        self.resource_types = resource_types
+        self._informers: Dict[Tuple[str, str], Informer] = {}
+
+    def stop(self):
+        for informer in self._informers.values():
+            informer.stop()
+        self._informers.clear()
+
+    async def get_informer(self, query: Query) -> Optional[Informer]:
+        """Return a synced informer which can answer the given query (or None)."""
+        clazz = query.api_obj_class
+        if clazz.endpoint not in self.resource_types:
+            return None
+        if query.field_selector is not everything:
+            return None
+        if issubclass(clazz, NamespacedAPIObject) and query.namespace is None:
+            # pykube would use the default namespace from kubeconfig
+            return None
+        key = (clazz.version, clazz.endpoint)
+        informer = self._informers.get(key)
+        if not informer:
+            informer = Informer(self.cluster_name, self.api, clazz)
+            self._informers[key] = informer
+            informer.start()
+        if not informer.synced.is_set():
+            # do not wait for the initial LIST (all objects of the type with full objects),
+            # the caller's own query is cheaper
+            return None
+        return informer
+
+    async def get_table(self, query: Query, params: dict = None) -> Table:
+        """Return Table for query from memory (if possible) or query the Kubernetes API."""
+        params = params or {}
+        selector = parse_simple_selector(query.selector)
+        if selector is None or "limit" in params or "continue" in params:
+            # pagination needs the API server's ordering and continue tokens
+            informer = None
+        else:
+            informer = await self.get_informer(query)
+        if not informer:
+            return await kubernetes.get_table(query, params)
+        namespace = None if query.namespace is pykube.all else query.namespace
+        # callers modify columns and rows (cells), so we need to copy them
+        rows = [
+            {"cells": list(row["cells"]), "object": row["object"]}
+            for row in informer.get_rows(namespace, selector)
+        ]
+        return Table(
+            query.api_obj_class,
+            {
+                "kind": "Table",
+                "columnDefinitions": [dict(col) for col in informer.columns],
+                "rows": rows,
+            },
+        )
+
+    async def iter_table_chunks(self, query: Query, chunk_size: int):
+        """Yield Tables for query, either one Table from memory or chunks from the Kubernetes API."""
+        selector = parse_simple_selector(query.selector)
+        informer = await self.get_informer(query) if selector is not None else None
+        if informer:
+            yield await self.get_table(query)
+        else:
+            async for table in kubernetes.iter_table_chunks(
+                query, chunk_size=chunk_size
+            ):
+                yield table
+
+    async def get_list(self, query: Query) -> list:
+        """Return list of objects for query from memory (if possible) or query the Kubernetes API."""
+        selector = parse_simple_selector(query.selector)
+        informer = await self.get_informer(query) if selector is not None else None
+        if not informer:
+            return await kubernetes.get_list(query)
+        namespace = None if query.namespace is pykube.all else query.namespace
+        return [
+            query.api_obj_class(query.api, row["object"])
+            for row in informer.get_rows(namespace, selector)
+        ]
+
+    async def get_metadata_list(self, query: Query) -> list:
+        """Return object metadata for query from memory (if possible) or query the Kubernetes API."""
+        selector = parse_simple_selector(query.selector)
+        informer = await self.get_informer(query) if selector is not None else None
+        if not informer:
+            return await kubernetes.get_metadata_list(query)
+        namespace = None if query.namespace is pykube.all else query.namespace
+        return [
+            row["object"]["metadata"] for row in informer.get_rows(namespace, selector)
+        ]
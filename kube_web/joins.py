@@ -1,7 +1,10 @@
 import collections
 import logging
 import re
+from functools import lru_cache
+from typing import Any
 from typing import Dict
+from typing import Tuple
 
 import jmespath
 import pykube
@@ -11,19 +14,84 @@ from pykube.objects import Pod
 
 from kube_web import kubernetes
 from kube_web import query_params as qp
+from kube_web.cache import get_token_key
+from kube_web.cache import TTLCache
 
 logger = logging.getLogger(__name__)
 
 NON_WORD_CHARS = re.compile("[^0-9a-zA-Z]+")
 SECRET_CONTENT_HIDDEN = "**SECRET-CONTENT-HIDDEN-BY-KUBE-WEB-VIEW**"
 
+NODE_CACHE_TTL_SECONDS = 10
 
+# metrics-server collects metrics every 15-60 seconds (--metric-resolution),
+# i.e. there is no need to query (and parse) metrics more often
+METRICS_CACHE_TTL_SECONDS = 15
+
+# parsed usage per cluster and metrics query for join=metrics
+_metrics_cache = TTLCache(METRICS_CACHE_TTL_SECONDS, name="metrics")
+
+# Node objects by name per cluster (and access token) for join=nodes
+_node_cache = TTLCache(NODE_CACHE_TTL_SECONDS, name="nodes")
+
+
+@lru_cache(maxsize=1000)
 def generate_name_from_spec(spec: str) -> str:
     words = NON_WORD_CHARS.split(spec)
     name = " ".join([word.capitalize() for word in words if word])
     return name
 
 
+@lru_cache(maxsize=1000)
+def parse_custom_columns(custom_columns_param: str) -> Tuple[Tuple[str, Any], ...]:
+    """Parse "customcols" query parameter into (name, compiled JMESPath expression) pairs."""
+    custom_column_names = []
+    custom_columns = {}
+    for part in filter(None, custom_columns_param.split(";")):
+        name, _, spec = part.partition("=")
+        if not spec:
+            spec = name
+            name = generate_name_from_spec(spec)
+        custom_column_names.append(name)
+        custom_columns[name] = jmespath.compile(spec)
+    # the result is shared across requests, so it must be immutable
+    return tuple((name, custom_columns[name]) for name in custom_column_names)
+
+
+def get_usage(metrics: dict) -> Tuple[float, float]:
+    """Return CPU and memory usage of PodMetrics (sum of all containers) or NodeMetrics."""
+    usage: Dict[str, float] = collections.defaultdict(float)
+    if "containers" in metrics:
+        for container in metrics["containers"]:
+            for k, v in container.get("usage", {}).items():
+                usage[k] += kubernetes.parse_resource(v)
+    else:
+        for k, v in metrics.get("usage", {}).items():
+            usage[k] += kubernetes.parse_resource(v)
+    return usage.get("cpu", 0), usage.get("memory", 0)
+
+
+async def get_usage_by_namespace_name(query, _cluster):
+    """Return parsed CPU/memory usage per (namespace, name) of the metrics query (cached for a few seconds)."""
+
+    async def get_usage_by_key():
+        metrics_list = await kubernetes.get_list(query)
+        return {
+            (metrics.namespace, metrics.name): get_usage(metrics.obj)
+            for metrics in metrics_list
+        }
+
+    key = (
+        _cluster.name,
+        # the query might use the user's access token (--cluster-auth-use-session-token)
+        get_token_key(getattr(query.api, "access_token", None)),
+        query.api_obj_class.kind,
+        str(query.namespace),
+        str(query.selector),
+    )
+    return await _metrics_cache.get(key, get_usage_by_key)
+
+
 async def join_metrics(
     wrap_query, _cluster, table, namespace: str, is_all_namespaces: bool, params: dict,
 ):
@@ -62,26 +130,14 @@ async def join_metrics(
     rows_joined = set()
 
     try:
-        metrics_list = await kubernetes.get_list(query)
+        usage_by_namespace_name = await get_usage_by_namespace_name(query, _cluster)
     except Exception as e:
         logger.warning(f"Failed to query {clazz.kind} in cluster {_cluster.name}: {e}")
     else:
-        for metrics in metrics_list:
-            key = (metrics.namespace, metrics.name)
+        for key, usage in usage_by_namespace_name.items():
             row_index = row_index_by_namespace_name.get(key)
             if row_index is not None:
-                usage: Dict[str, float] = collections.defaultdict(float)
-                if "containers" in metrics.obj:
-                    for container in metrics.obj["containers"]:
-                        for k, v in container.get("usage", {}).items():
-                            usage[k] += kubernetes.parse_resource(v)
-                else:
-                    for k, v in metrics.obj.get("usage", {}).items():
-                        usage[k] += kubernetes.parse_resource(v)
-
-                table.rows[row_index]["cells"].extend(
-                    [usage.get("cpu", 0), usage.get("memory", 0)]
-                )
+                table.rows[row_index]["cells"].extend(usage)
                 rows_joined.add(row_index)
 
     # fill up cells where we have no metrics
@@ -91,6 +147,62 @@ async def join_metrics(
             row["cells"].extend([0, 0])
 
 
+async def get_nodes_by_name(wrap_query, _cluster) -> Dict[str, dict]:
+    """Return all Node objects of the cluster by name (cached for a few seconds)."""
+    node_query = wrap_query(Node.objects(_cluster.api))
+
+    async def get_nodes():
+        node_list = await _cluster.informer_cache.get_list(node_query)
+        return {node.name: node.obj for node in node_list}
+
+    # the query might use the user's access token (--cluster-auth-use-session-token)
+    key = (_cluster.name, get_token_key(getattr(node_query.api, "access_token", None)))
+    return await _node_cache.get(key, get_nodes)
+
+
+def has_full_object(row) -> bool:
+    """Return whether the Table row contains the full object (and not only its metadata)."""
+    return row["object"].get("kind") not in (None, "PartialObjectMetadata")
+
+
+async def get_objects_by_row_index(
+    wrap_query, _cluster, table, namespace: str, is_all_namespaces: bool, params: dict,
+) -> Dict[int, dict]:
+    """LIST the full objects of the table rows."""
+    clazz = table.api_obj_class
+    row_index_by_namespace_name = {}
+    for i, row in enumerate(table.rows):
+        row_index_by_namespace_name[
+            (
+                row["object"]["metadata"].get("namespace"),
+                row["object"]["metadata"]["name"],
+            )
+        ] = i
+
+    query = wrap_query(clazz.objects(_cluster.api))
+
+    if issubclass(clazz, NamespacedAPIObject):
+        if is_all_namespaces:
+            query = query.filter(namespace=pykube.all)
+        elif namespace:
+            query = query.filter(namespace=namespace)
+
+    if params.get(qp.SELECTOR):
+        query = query.filter(selector=params[qp.SELECTOR])
+
+    objects_by_row_index = {}
+    try:
+        object_list = await _cluster.informer_cache.get_list(query)
+    except Exception as e:
+        logger.warning(f"Failed to query {clazz.kind} in cluster {_cluster.name}: {e}")
+    else:
+        for obj in object_list:
+            row_index = row_index_by_namespace_name.get((obj.namespace, obj.name))
+            if row_index is not None:
+                objects_by_row_index[row_index] = obj.obj
+    return objects_by_row_index
+
+
 async def join_custom_columns(
     wrap_query,
     _cluster,
@@ -107,84 +219,51 @@ async def join_custom_columns(
 
     clazz = table.api_obj_class
 
-    custom_column_names = []
-    custom_columns = {}
-    for part in filter(None, custom_columns_param.split(";")):
-        name, _, spec = part.partition("=")
-        if not spec:
-            spec = name
-            name = generate_name_from_spec(spec)
-        custom_column_names.append(name)
-        custom_columns[name] = jmespath.compile(spec)
+    custom_columns = parse_custom_columns(custom_columns_param)
 
     if not custom_columns:
         # nothing to do
         return
 
-    for name in custom_column_names:
+    for name, _ in custom_columns:
         table.columns.append({"name": name})
 
-    row_index_by_namespace_name = {}
-    for i, row in enumerate(table.rows):
-        row_index_by_namespace_name[
-            (
-                row["object"]["metadata"].get("namespace"),
-                row["object"]["metadata"]["name"],
-            )
-        ] = i
-
     nodes = None
     if params.get(qp.JOIN) == "nodes" and clazz.kind == Pod.kind:
-        node_query = wrap_query(Node.objects(_cluster.api))
         try:
-            node_list = await kubernetes.get_list(node_query)
+            nodes = await get_nodes_by_name(wrap_query, _cluster)
         except Exception as e:
             logger.warning(
                 f"Failed to query {Node.kind} in cluster {_cluster.name}: {e}"
             )
-        else:
-            nodes = {}
-            for node in node_list:
-                nodes[node.name] = node
-
-    query = wrap_query(clazz.objects(_cluster.api))
 
-    if issubclass(clazz, NamespacedAPIObject):
-        if is_all_namespaces:
-            query = query.filter(namespace=pykube.all)
-        elif namespace:
-            query = query.filter(namespace=namespace)
-
-    if params.get(qp.SELECTOR):
-        query = query.filter(selector=params[qp.SELECTOR])
-
-    rows_joined = set()
-
-    try:
-        object_list = await kubernetes.get_list(query)
-    except Exception as e:
-        logger.warning(f"Failed to query {clazz.kind} in cluster {_cluster.name}: {e}")
+    if all(has_full_object(row) for row in table.rows):
+        # the Table was requested with includeObject=Object (or served from memory),
+        # i.e. we don't need to LIST the objects again
+        objects_by_row_index = {i: row["object"] for i, row in enumerate(table.rows)}
     else:
-        for obj in object_list:
-            key = (obj.namespace, obj.name)
-            row_index = row_index_by_namespace_name.get(key)
-            if row_index is not None:
-                for name in custom_column_names:
-                    expression = custom_columns[name]
-                    if clazz.kind == "Secret" and not config.show_secrets:
-                        value = SECRET_CONTENT_HIDDEN
-                    else:
-                        if nodes:
-                            node = nodes.get(obj.obj["spec"].get("nodeName"))
-                            data = {"node": node and node.obj}
-                            data.update(obj.obj)
-                        else:
-                            data = obj.obj
-                        value = expression.search(data)
-                    table.rows[row_index]["cells"].append(value)
-                rows_joined.add(row_index)
+        objects_by_row_index = await get_objects_by_row_index(
+            wrap_query, _cluster, table, namespace, is_all_namespaces, params
+        )
+
+    if clazz.kind == "Secret" and not config.show_secrets:
+        for row_index in objects_by_row_index:
+            table.rows[row_index]["cells"].extend(
+                [SECRET_CONTENT_HIDDEN] * len(custom_columns)
+            )
+    else:
+        for row_index, obj in objects_by_row_index.items():
+            if nodes:
+                # shallow merge (once per row), i.e. only the top-level keys are copied
+                data = {"node": nodes.get(obj.get("spec", {}).get("nodeName"))}
+                data.update(obj)
+            else:
+                data = obj
+            table.rows[row_index]["cells"].extend(
+                expression.search(data) for _, expression in custom_columns
+            )
 
     # fill up cells where we have no values
     for i, row in enumerate(table.rows):
-        if i not in rows_joined:
-            row["cells"].extend([None] * len(custom_column_names))
+        if i not in objects_by_row_index:
+            row["cells"].extend([None] * len(custom_columns))
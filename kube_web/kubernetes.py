@@ -1,13 +1,25 @@
 import asyncio
+import collections
 import concurrent.futures
+import json
 import re
+import threading
+from functools import lru_cache
 from functools import partial
+from typing import Dict
+from typing import Tuple
+from urllib.parse import urlencode
 
+import pykube
+from pykube import ObjectDoesNotExist
 from pykube.http import HTTPClient
 from pykube.objects import APIObject
 from pykube.objects import NamespacedAPIObject
 from pykube.objects import Pod
 from pykube.query import Query
+from pykube.query import Table
+
+from kube_web import async_http
 
 FACTORS = {
     "n": 1 / 1000000000,
@@ -32,6 +44,32 @@ RESOURCE_PATTERN = re.compile(r"^(\d*)(\D*)$")
 
 thread_pool = concurrent.futures.ThreadPoolExecutor(thread_name_prefix="pykube")
 
+# use the native asyncio HTTP client instead of running pykube/requests in the thread pool,
+# this is enabled via the --async-http-client command line option
+use_async_http = False
+
+TABLE_ACCEPT_HEADER = "application/json;as=Table;v=v1beta1;g=meta.k8s.io"
+
+# only return object metadata, older API servers fall back to the v1beta1 or full object list
+METADATA_LIST_ACCEPT_HEADER = ",".join(
+    [
+        "application/json;as=PartialObjectMetadataList;v=v1;g=meta.k8s.io",
+        "application/json;as=PartialObjectMetadataList;v=v1beta1;g=meta.k8s.io",
+        "application/json",
+    ]
+)
+
+# number of objects to request per LIST call when iterating over large collections in chunks
+LIST_CHUNK_SIZE = 500
+
+# the API server will close WATCH requests after this time
+WATCH_TIMEOUT_SECONDS = 300
+
+# currently running API calls (futures) by query key, see _single_flight()
+_in_flight: Dict[Tuple, asyncio.Future] = {}
+# number of callers awaiting each running API call (future)
+_waiters: Dict[asyncio.Future, int] = collections.Counter()
+
 
 # https://github.com/kubernetes/community/blob/master/contributors/design-proposals/instrumentation/resource-metrics-api.md
 class NodeMetrics(APIObject):
@@ -49,6 +87,7 @@ class PodMetrics(NamespacedAPIObject):
     kind = "PodMetrics"
 
 
+@lru_cache(maxsize=10000)
 def parse_resource(v):
     """
     Parse a Kubernetes resource spec.
@@ -62,12 +101,40 @@ def parse_resource(v):
     >>> parse_resource('2k')
     2048
     """
+    # fast path without regex for the common formats (e.g. "123456n" or "2048Ki")
+    if v[-1:].isdigit():
+        return int(v)
+    if v[-1:] == "i" and v[:-2].isdigit():
+        return int(v[:-2]) * FACTORS[v[-2:]]
+    if v[:-1].isdigit():
+        return int(v[:-1]) * FACTORS[v[-1]]
     match = RESOURCE_PATTERN.match(v)
     factor = FACTORS[match.group(2)]
     return int(match.group(1)) * factor
 
 
+def _query_kwargs(query: Query, params: dict = None, **kwargs):
+    """Return HTTPClient.get arguments for the given query (same as pykube's Query.execute)."""
+    # note: _build_api_url modifies the passed dict
+    kwargs["url"] = query._build_api_url(params=dict(params or {}))
+    if query.api_obj_class.base:
+        kwargs["base"] = query.api_obj_class.base
+    if query.api_obj_class.version:
+        kwargs["version"] = query.api_obj_class.version
+    if query.namespace is not None and query.namespace is not pykube.all:
+        kwargs["namespace"] = query.namespace
+    return kwargs
+
+
+async def _execute(query: Query, params: dict = None, **kwargs):
+    response = await async_http.get(query.api, **_query_kwargs(query, params, **kwargs))
+    response.raise_for_status()
+    return response
+
+
 async def api_get(api, **kwargs):
+    if use_async_http:
+        return await async_http.get(api, **kwargs)
     loop = asyncio.get_event_loop()
     return await loop.run_in_executor(
         thread_pool, partial(HTTPClient.get, **kwargs), api
@@ -75,25 +142,240 @@ async def api_get(api, **kwargs):
 
 
 async def get_by_name(query: Query, name: str):
+    if use_async_http:
+        kwargs = {"url": f"{query.api_obj_class.endpoint}/{name}"}
+        kwargs["namespace"] = query.namespace
+        if query.api_obj_class.base:
+            kwargs["base"] = query.api_obj_class.base
+        if query.api_obj_class.version:
+            kwargs["version"] = query.api_obj_class.version
+        response = await async_http.get(query.api, **kwargs)
+        if not response.ok:
+            if response.status_code == 404:
+                raise ObjectDoesNotExist(f"{name} does not exist.")
+            query.api.raise_for_status(response)
+        return query.api_obj_class(query.api, response.json())
     loop = asyncio.get_event_loop()
     return await loop.run_in_executor(thread_pool, Query.get_by_name, query, name)
 
 
-async def get_table(query: Query):
+def _get_table(query: Query, params: dict = None):
+    response = query.api.get(
+        **_query_kwargs(query, params, headers={"Accept": TABLE_ACCEPT_HEADER})
+    )
+    response.raise_for_status()
+    return Table(query.api_obj_class, response.json())
+
+
+async def _fetch_table(query: Query, params: dict = None):
+    if use_async_http:
+        response = await _execute(
+            query, params, headers={"Accept": TABLE_ACCEPT_HEADER}
+        )
+        return Table(query.api_obj_class, response.json())
+    loop = asyncio.get_event_loop()
+    return await loop.run_in_executor(thread_pool, _get_table, query, params)
+
+
+def _query_key(operation: str, query: Query, params: dict = None):
+    """Identify a query: each API client (HTTPClient) has its own auth identity."""
+    return (
+        operation,
+        id(query.api),
+        query.api_obj_class.version,
+        query.namespace,
+        query._build_api_url(params=dict(params or {})),
+    )
+
+
+async def _single_flight(key, func):
+    """Run func() once for concurrent calls with the same key and let all callers await the result."""
+    future = _in_flight.get(key)
+    if future is None:
+        future = asyncio.ensure_future(func())
+        _in_flight[key] = future
+
+        def done(f):
+            if _in_flight.get(key) is f:
+                del _in_flight[key]
+
+        future.add_done_callback(done)
+    _waiters[future] += 1
+    try:
+        # shield the shared call, i.e. one cancelled caller does not cancel it for everybody
+        return await asyncio.shield(future)
+    finally:
+        _waiters[future] -= 1
+        if not _waiters[future]:
+            del _waiters[future]
+            if not future.done():
+                # all callers were cancelled (e.g. deadline reached): cancel the API call,
+                # new callers must not get the cancelled future (done() is called later)
+                if _in_flight.get(key) is future:
+                    del _in_flight[key]
+                future.cancel()
+
+
+def copy_table(table: Table) -> Table:
+    """Copy table columns and rows (cells), but not the row objects."""
+    obj = dict(table.obj)
+    obj["columnDefinitions"] = [dict(col) for col in table.columns or []]
+    if table.rows is not None:
+        obj["rows"] = [dict(row, cells=list(row["cells"])) for row in table.rows]
+    return Table(table.api_obj_class, obj)
+
+
+async def get_table(query: Query, params: dict = None):
+    """Return query result as Table, optional params are passed to the API (e.g. "includeObject")."""
+    table = await _single_flight(
+        _query_key("table", query, params), partial(_fetch_table, query, params)
+    )
+    # every caller gets its own copy as callers modify columns and cells
+    return copy_table(table)
+
+
+async def iter_table_chunks(
+    query: Query, params: dict = None, chunk_size: int = LIST_CHUNK_SIZE
+):
+    """Yield query result as Tables of at most chunk_size rows (LIST with limit/continue)."""
+    params = dict(params or {}, limit=chunk_size)
+    while True:
+        table = await get_table(query, params)
+        yield table
+        continue_token = (table.obj.get("metadata") or {}).get("continue")
+        if not continue_token:
+            break
+        params["continue"] = continue_token
+
+
+async def _stream_lines_in_thread(api, kwargs):
+    """Bridge a blocking streaming response (requests) to an async generator."""
     loop = asyncio.get_event_loop()
-    return await loop.run_in_executor(thread_pool, Query.as_table, query)
+    queue: asyncio.Queue = asyncio.Queue()
+    done = object()
+    stopped = threading.Event()
+
+    def run():
+        try:
+            with api.get(stream=True, **kwargs) as response:
+                response.raise_for_status()
+                for line in response.iter_lines():
+                    if stopped.is_set():
+                        # note: we cannot close the response from the event loop
+                        # as this would block until the next read returns
+                        return
+                    if line:
+                        loop.call_soon_threadsafe(queue.put_nowait, line)
+            loop.call_soon_threadsafe(queue.put_nowait, done)
+        except Exception as e:
+            if not stopped.is_set():
+                loop.call_soon_threadsafe(queue.put_nowait, e)
+
+    # use a dedicated thread as WATCH requests are long running and would block the thread pool
+    thread = threading.Thread(target=run, name="pykube-watch", daemon=True)
+    thread.start()
+    try:
+        while True:
+            item = await queue.get()
+            if item is done:
+                break
+            if isinstance(item, Exception):
+                raise item
+            yield item
+    finally:
+        stopped.set()
+
+
+async def watch_table(query: Query, resource_version: str, params: dict = None):
+    """Yield WATCH events (objects are Tables) starting from the given resourceVersion."""
+    params = dict(params or {})
+    params["watch"] = "true"
+    params["resourceVersion"] = resource_version
+    params["timeoutSeconds"] = str(WATCH_TIMEOUT_SECONDS)
+    params["allowWatchBookmarks"] = "true"
+    kwargs = _query_kwargs(
+        query,
+        params,
+        headers={"Accept": TABLE_ACCEPT_HEADER},
+        # allow some extra time for the API server to close the connection
+        timeout=WATCH_TIMEOUT_SECONDS + 30,
+    )
+    if use_async_http:
+        lines = async_http.stream_lines(query.api, **kwargs)
+    else:
+        lines = _stream_lines_in_thread(query.api, kwargs)
+    async for line in lines:
+        yield json.loads(line)
 
 
 def _get_list(query: Query):
     return list(query.iterator())
 
 
-async def get_list(query: Query):
+async def _fetch_list(query: Query):
+    if use_async_http:
+        response = await _execute(query)
+        return [
+            query.api_obj_class(query.api, obj)
+            for obj in response.json().get("items") or []
+        ]
     loop = asyncio.get_event_loop()
     return await loop.run_in_executor(thread_pool, _get_list, query)
 
 
+async def get_list(query: Query):
+    objects = await _single_flight(
+        _query_key("list", query), partial(_fetch_list, query)
+    )
+    return list(objects)
+
+
+def _get_metadata_list(query: Query):
+    response = query.api.get(
+        **_query_kwargs(query, headers={"Accept": METADATA_LIST_ACCEPT_HEADER})
+    )
+    response.raise_for_status()
+    return [item["metadata"] for item in response.json().get("items") or []]
+
+
+async def _fetch_metadata_list(query: Query):
+    if use_async_http:
+        response = await _execute(
+            query, headers={"Accept": METADATA_LIST_ACCEPT_HEADER}
+        )
+        return [item["metadata"] for item in response.json().get("items") or []]
+    loop = asyncio.get_event_loop()
+    return await loop.run_in_executor(thread_pool, _get_metadata_list, query)
+
+
+async def get_metadata_list(query: Query):
+    """Return metadata of all objects matching the query (without spec, status, or Table cells)."""
+    items = await _single_flight(
+        _query_key("metadata", query), partial(_fetch_metadata_list, query)
+    )
+    return list(items)
+
+
 async def logs(pod: Pod, **kwargs):
+    if use_async_http:
+        params = {}
+        if kwargs.get("container") is not None:
+            params["container"] = kwargs["container"]
+        if kwargs.get("timestamps"):
+            params["timestamps"] = "true"
+        if kwargs.get("tail_lines") is not None:
+            params["tailLines"] = int(kwargs["tail_lines"])
+        operation = "log"
+        if params:
+            operation += f"?{urlencode(params)}"
+        response = await async_http.get(
+            pod.api,
+            **pod.api_kwargs(
+                version=pod.version, namespace=pod.namespace, operation=operation
+            ),
+        )
+        response.raise_for_status()
+        return response.text
     loop = asyncio.get_event_loop()
     pod_logs = partial(Pod.logs, **kwargs)
     return await loop.run_in_executor(thread_pool, pod_logs, pod)
@@ -17,6 +17,7 @@ from .cluster_manager import ClusterManager
 from .selector import parse_selector
 from .web import get_app
 from kube_web import __version__
+from kube_web import kubernetes
 
 
 logger = logging.getLogger(__name__)
@@ -186,6 +187,86 @@ def parse_args(argv=None):
         help="Maximum number of current searches (across clusters/resource types), this allows limiting memory consumption and Kubernetes API calls (default: 100)",
         default=100,
     )
+    parser.add_argument(
+        "--search-stream",
+        action="store_true",
+        help="Stream search results to the browser as clusters respond (requires JavaScript)",
+    )
+    parser.add_argument(
+        "--search-index-resource-types",
+        type=comma_separated_values,
+        help="Comma-separated list of resource types to index in memory (refreshed in the background) to answer search queries without querying all clusters, e.g. 'deployments,services,ingresses' (default: none)",
+        default=[],
+    )
+    parser.add_argument(
+        "--search-index-refresh-interval",
+        type=float,
+        help="Rebuild the search index every given number of seconds (default: 60)",
+        default=60,
+    )
+    parser.add_argument(
+        "--async-http-client",
+        action="store_true",
+        help="Use the native asyncio HTTP client (aiohttp) with per-cluster connection pools for Kubernetes API calls instead of a thread pool with blocking requests (tls-server-name and retrying WATCH requests on 401 are not supported)",
+    )
+    parser.add_argument(
+        "--informer-resource-types",
+        type=comma_separated_values,
+        help="Comma-separated list of resource types to keep in memory (LIST once, then WATCH) to serve lists, search, and joins, e.g. 'pods,deployments,nodes,namespaces' (default: none)",
+        default=[],
+    )
+    parser.add_argument(
+        "--namespace-cache-ttl",
+        type=float,
+        help="Cache the list of namespaces per cluster for the given number of seconds, stale lists are refreshed in the background (default: 0, i.e. no caching)",
+        default=0,
+    )
+    parser.add_argument(
+        "--api-discovery-cache-path",
+        type=Path,
+        help="Path to directory to persist discovered API resource types per cluster, the cache is loaded on startup and revalidated in the background",
+    )
+    parser.add_argument(
+        "--api-discovery-refresh-interval",
+        type=float,
+        help="Discover API resource types (e.g. new CRDs) of each cluster in the background every given number of seconds (default: 0, i.e. only discover once)",
+        default=0,
+    )
+    parser.add_argument(
+        "--cluster-reload-interval",
+        type=float,
+        help="Reload the list of clusters (e.g. from the kubeconfig file or Cluster Registry) at most every given number of seconds (default: 10)",
+        default=10,
+    )
+    parser.add_argument(
+        "--cluster-connect-timeout",
+        type=float,
+        help="Timeout in seconds to connect to a cluster's API server (default: 0, i.e. same as the HTTP read timeout)",
+        default=0,
+    )
+    parser.add_argument(
+        "--cluster-timeout",
+        type=float,
+        help="Deadline in seconds for all API calls to one cluster per page view, clusters not responding in time are shown as errors (default: 0, i.e. no deadline)",
+        default=0,
+    )
+    parser.add_argument(
+        "--prewarm-resource-registries",
+        action="store_true",
+        help="Initialize the resource registries (API discovery) of all clusters on startup, the health endpoint reports 503 until this is done",
+    )
+    parser.add_argument(
+        "--prewarm-concurrency",
+        type=int,
+        help="Maximum number of clusters to initialize concurrently on startup (default: 10)",
+        default=10,
+    )
+    parser.add_argument(
+        "--prewarm-timeout",
+        type=float,
+        help="Timeout in seconds to initialize the resource registry of one cluster on startup (default: 30)",
+        default=30,
+    )
     parser.add_argument(
         "--default-label-columns",
         type=key_value_pairs,
@@ -243,6 +324,8 @@ def main(argv=None):
     config_str = ", ".join(f"{k}={v}" for k, v in sorted(vars(args).items()))
     logger.info(f"Kubernetes Web View v{__version__} started with {config_str}")
 
+    kubernetes.use_async_http = args.async_http_client
+
     if args.clusters:
         cluster_discoverer = StaticClusterDiscoverer(args.clusters)
     elif args.cluster_registry_url:
@@ -262,11 +345,31 @@ def main(argv=None):
             cluster_discoverer = KubeconfigDiscoverer(
                 args.kubeconfig_path, args.kubeconfig_contexts
             )
+    if args.search_index_resource_types and args.cluster_auth_use_session_token:
+        # objects need to be queried with each user's own access token
+        logger.warning(
+            "Search index is disabled as --cluster-auth-use-session-token is set"
+        )
+        args.search_index_resource_types = []
+
+    informer_resource_types = frozenset(args.informer_resource_types)
+    if informer_resource_types and args.cluster_auth_use_session_token:
+        # objects need to be queried with each user's own access token
+        logger.warning(
+            "Informer cache is disabled as --cluster-auth-use-session-token is set"
+        )
+        informer_resource_types = frozenset()
+
     cluster_manager = ClusterManager(
         cluster_discoverer,
         args.cluster_label_selector,
         args.cluster_auth_token_path,
         args.preferred_api_versions,
+        informer_resource_types,
+        args.api_discovery_cache_path,
+        args.api_discovery_refresh_interval,
+        args.cluster_reload_interval,
+        args.cluster_connect_timeout,
     )
     app = get_app(cluster_manager, args)
     aiohttp.web.run_app(app, port=args.port, handle_signals=False)
@@ -3,6 +3,7 @@ SELECTOR = "selector"
 FILTER = "filter"
 JOIN = "join"
 LIMIT = "limit"
+CONTINUE = "continue"
 HIDDEN_COLUMNS = "hidecols"
 LABEL_COLUMNS = "labelcols"
 CUSTOM_COLUMNS = "customcols"
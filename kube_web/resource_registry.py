@@ -1,6 +1,12 @@
 import asyncio
+import hashlib
+import json
 import logging
+from pathlib import Path
+from typing import Dict
 from typing import List
+from typing import Optional
+from typing import Tuple
 from typing import Type
 
 from pykube.objects import APIObject
@@ -14,10 +20,12 @@ throw_exception = object()
 
 
 class ResourceTypeNotFound(Exception):
-    def __init__(self, resource_type: str, namespaced: bool):
-        super().__init__(
-            f"{'Namespaced' if namespaced else 'Cluster'} resource type '{resource_type}' not found"
-        )
+    def __init__(self, resource_type: str, namespaced: Optional[bool]):
+        if namespaced is None:
+            scope = "Resource"
+        else:
+            scope = f"{'Namespaced' if namespaced else 'Cluster'} resource"
+        super().__init__(f"{scope} type '{resource_type}' not found")
 
 
 async def discover_api_group(api, group_version, pref_version):
@@ -27,7 +35,8 @@ async def discover_api_group(api, group_version, pref_version):
     return group_version, pref_version, response.json()["resources"]
 
 
-async def discover_api_resources(api):
+async def discover_api_resources(api, failed_group_versions: set = None):
+    """Yield all resources of the cluster, group versions which failed are added to the given set."""
     core_version = "v1"
     r = await kubernetes.api_get(api, version=core_version)
     r.raise_for_status()
@@ -43,10 +52,12 @@ async def discover_api_resources(api):
     r = await kubernetes.api_get(api, version="/apis")
     r.raise_for_status()
     tasks = []
+    group_versions = []
     for group in r.json()["groups"]:
         pref_version = group["preferredVersion"]["groupVersion"]
         for version in group["versions"]:
             group_version = version["groupVersion"]
+            group_versions.append(group_version)
             tasks.append(
                 asyncio.create_task(
                     discover_api_group(api, group_version, pref_version)
@@ -55,11 +66,17 @@ async def discover_api_resources(api):
 
     yielded = set()
     non_preferred = []
-    for result_or_exception in await asyncio.gather(*tasks, return_exceptions=True):
+    for group_version, result_or_exception in zip(
+        group_versions, await asyncio.gather(*tasks, return_exceptions=True)
+    ):
         if isinstance(result_or_exception, Exception):
             # do not crash if one API group is not available
             # see https://codeberg.org/hjacobs/kube-web-view/issues/64
-            logger.warning(f"Failed to discover API group: {result_or_exception}")
+            logger.warning(
+                f"Failed to discover API group {group_version}: {result_or_exception}"
+            )
+            if failed_group_versions is not None:
+                failed_group_versions.add(group_version)
             continue
         group_version, pref_version, resources = result_or_exception
         for resource in resources:
@@ -97,9 +114,11 @@ def namespaced_object_factory(kind: str, name: str, api_version: str):
     )
 
 
-async def get_namespaced_resource_types(api):
+async def get_namespaced_resource_types(api, failed_group_versions: set = None):
     logger.debug(f"Getting resource types for {api.url}..")
-    async for namespaced, api_version, resource in discover_api_resources(api):
+    async for namespaced, api_version, resource in discover_api_resources(
+        api, failed_group_versions
+    ):
         if namespaced:
             clazz = namespaced_object_factory(
                 resource["kind"], resource["name"], api_version
@@ -112,42 +131,197 @@ async def get_namespaced_resource_types(api):
             yield clazz
 
 
+def _to_cache_entry(clazz) -> list:
+    return [
+        issubclass(clazz, NamespacedAPIObject),
+        clazz.version,
+        clazz.kind,
+        clazz.endpoint,
+    ]
+
+
+def _from_cache_entry(entry: list):
+    namespaced, api_version, kind, name = entry
+    if namespaced:
+        return namespaced_object_factory(kind, name, api_version)
+    else:
+        return cluster_object_factory(kind, name, api_version)
+
+
 class ResourceRegistry:
-    def __init__(self, api, preferred_api_versions: dict):
+    def __init__(
+        self,
+        api,
+        preferred_api_versions: dict,
+        cache_path: Path = None,
+        refresh_interval: float = 0,
+    ):
         self.api = api
         self.preferred_api_versions = preferred_api_versions
+        self.cache_path = cache_path
+        self.refresh_interval = refresh_interval
         self._lock = asyncio.Lock()
+        self._refresh_task: Optional[asyncio.Task] = None
+        # keep a reference, the event loop only keeps weak references to tasks
+        self._revalidate_task: Optional[asyncio.Task] = None
         self._cluster_resource_types: List[Type[APIObject]] = []
         self._namespaced_resource_types: List[Type[NamespacedAPIObject]] = []
+        # indexes for fast lookups, keys start with "namespaced" flag:
+        # (namespaced, plural) -> classes in order of preference
+        self._classes_by_plural: Dict[Tuple[bool, str], List[Type[APIObject]]] = {}
+        # (namespaced, apiVersion, kind) -> class
+        self._class_by_api_version_kind: Dict[
+            Tuple[bool, str, str], Type[APIObject]
+        ] = {}
+
+    @property
+    def cache_file(self) -> Path:
+        # one file per API server URL, the URL might contain arbitrary characters
+        key = hashlib.sha256(self.api.url.encode("utf-8")).hexdigest()
+        return self.cache_path / f"{key}.json"
+
+    def _load_cache(self) -> Optional[list]:
+        try:
+            with self.cache_file.open() as fd:
+                data = json.load(fd)
+            if data.get("url") != self.api.url:
+                return None
+            return [_from_cache_entry(entry) for entry in data["resources"]]
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"Failed to load API discovery cache {self.cache_file}: {e}")
+            return None
+
+    def _save_cache(self, resource_types: list):
+        data = {
+            "url": self.api.url,
+            "resources": [_to_cache_entry(clazz) for clazz in resource_types],
+        }
+        try:
+            self.cache_path.mkdir(parents=True, exist_ok=True)
+            # write to temporary file first to never leave a partially written cache file
+            tmp_file = self.cache_file.with_suffix(".tmp")
+            with tmp_file.open("w") as fd:
+                json.dump(data, fd)
+            tmp_file.replace(self.cache_file)
+        except Exception as e:
+            logger.warning(f"Failed to save API discovery cache {self.cache_file}: {e}")
+
+    def _set_resource_types(self, resource_types: list):
+        namespaced_resource_types = []
+        cluster_resource_types = []
+        for clazz in resource_types:
+            if issubclass(clazz, NamespacedAPIObject):
+                namespaced_resource_types.append(clazz)
+            else:
+                cluster_resource_types.append(clazz)
+            # the first entry is the preferred API version
+            if clazz.endpoint not in self.preferred_api_versions:
+                self.preferred_api_versions[clazz.endpoint] = clazz.version
+        namespaced_resource_types.sort(
+            key=lambda c: 0
+            if c.version == self.preferred_api_versions.get(c.endpoint)
+            else 1
+        )
+        cluster_resource_types.sort(
+            key=lambda c: 0
+            if c.version == self.preferred_api_versions.get(c.endpoint)
+            else 1
+        )
+        classes_by_plural: Dict[Tuple[bool, str], List[Type[APIObject]]] = {}
+        class_by_api_version_kind: Dict[Tuple[bool, str, str], Type[APIObject]] = {}
+        for namespaced, _types in (
+            (True, namespaced_resource_types),
+            (False, cluster_resource_types),
+        ):
+            for clazz in _types:
+                classes_by_plural.setdefault((namespaced, clazz.endpoint), []).append(
+                    clazz
+                )
+                class_by_api_version_kind.setdefault(
+                    (namespaced, clazz.version, clazz.kind), clazz
+                )
+        # replace lists and indexes at once (no await in between)
+        self._namespaced_resource_types = namespaced_resource_types
+        self._cluster_resource_types = cluster_resource_types
+        self._classes_by_plural = classes_by_plural
+        self._class_by_api_version_kind = class_by_api_version_kind
+
+    async def discover(self):
+        """Discover all resource types via the Kubernetes API and update the (optional) cache file."""
+        failed_group_versions: set = set()
+        resource_types = [
+            clazz
+            async for clazz in get_namespaced_resource_types(
+                self.api, failed_group_versions=failed_group_versions
+            )
+        ]
+        if failed_group_versions:
+            # keep the previously discovered types of temporarily unavailable API groups
+            # (e.g. metrics.k8s.io), otherwise their pages would return 404 until the next refresh
+            discovered = set(
+                (issubclass(clazz, NamespacedAPIObject), clazz.version, clazz.endpoint)
+                for clazz in resource_types
+            )
+            for clazz in self._namespaced_resource_types + self._cluster_resource_types:
+                key = (
+                    issubclass(clazz, NamespacedAPIObject),
+                    clazz.version,
+                    clazz.endpoint,
+                )
+                if clazz.version in failed_group_versions and key not in discovered:
+                    resource_types.append(clazz)
+        self._set_resource_types(resource_types)
+        if self.cache_path:
+            self._save_cache(resource_types)
+
+    async def revalidate(self):
+        try:
+            await self.discover()
+        except Exception as e:
+            logger.warning(
+                f"Failed to revalidate resource registry for {self.api.url}: {e}"
+            )
 
     async def initialize(self):
         async with self._lock:
             if self._namespaced_resource_types and self._cluster_resource_types:
                 # already initialized!
                 return
+            if self.cache_path:
+                resource_types = self._load_cache()
+                if resource_types:
+                    logger.info(
+                        f"Loaded resource registry for {self.api.url} from {self.cache_file}"
+                    )
+                    self._set_resource_types(resource_types)
+                    # new CRDs might have been registered in the meantime
+                    self._revalidate_task = asyncio.create_task(self.revalidate())
+                    self._start_refresh()
+                    return
             logger.info(f"Initializing resource registry for {self.api.url}..")
-            namespaced_resource_types = []
-            cluster_resource_types = []
-            async for clazz in get_namespaced_resource_types(self.api):
-                if issubclass(clazz, NamespacedAPIObject):
-                    namespaced_resource_types.append(clazz)
-                else:
-                    cluster_resource_types.append(clazz)
-                # the first entry is the preferred API version
-                if clazz.endpoint not in self.preferred_api_versions:
-                    self.preferred_api_versions[clazz.endpoint] = clazz.version
-            namespaced_resource_types.sort(
-                key=lambda c: 0
-                if c.version == self.preferred_api_versions.get(c.endpoint)
-                else 1
-            )
-            cluster_resource_types.sort(
-                key=lambda c: 0
-                if c.version == self.preferred_api_versions.get(c.endpoint)
-                else 1
-            )
-            self._namespaced_resource_types = namespaced_resource_types
-            self._cluster_resource_types = cluster_resource_types
+            await self.discover()
+            self._start_refresh()
+
+    async def refresh_periodically(self):
+        """Discover resource types again and again, e.g. to find newly installed CRDs."""
+        while True:
+            await asyncio.sleep(self.refresh_interval)
+            logger.debug(f"Refreshing resource registry for {self.api.url}..")
+            await self.revalidate()
+
+    def _start_refresh(self):
+        if self.refresh_interval > 0 and not self._refresh_task:
+            self._refresh_task = asyncio.create_task(self.refresh_periodically())
+
+    def stop(self):
+        if self._revalidate_task:
+            self._revalidate_task.cancel()
+            self._revalidate_task = None
+        if self._refresh_task:
+            self._refresh_task.cancel()
+            self._refresh_task = None
 
     @property
     async def cluster_resource_types(self):
@@ -164,37 +338,30 @@ class ResourceRegistry:
     async def get_class_by_plural_name(
         self,
         plural: str,
-        namespaced: bool,
+        namespaced: Optional[bool],
         default=throw_exception,
         api_version: str = None,
     ):
-        _types = (
-            self.namespaced_resource_types
-            if namespaced
-            else self.cluster_resource_types
-        )
-        clazz = None
-        for c in await _types:
-            if c.endpoint == plural and (c.version == api_version or not api_version):
-                clazz = c
-                break
-        if not clazz and default is throw_exception:
+        """Return preferred class for resource type, namespaced=None looks for namespaced types first, then cluster-scoped."""
+        if not self._classes_by_plural:
+            await self.initialize()
+        scopes = (True, False) if namespaced is None else (namespaced,)
+        for scope in scopes:
+            for clazz in self._classes_by_plural.get((scope, plural), []):
+                if clazz.version == api_version or not api_version:
+                    return clazz
+        if default is throw_exception:
             raise ResourceTypeNotFound(plural, namespaced)
-        return clazz
+        return default
 
     async def get_class_by_api_version_kind(
         self, api_version: str, kind: str, namespaced: bool, default=throw_exception
     ):
-        _types = (
-            self.namespaced_resource_types
-            if namespaced
-            else self.cluster_resource_types
-        )
-        clazz = None
-        for c in await _types:
-            if c.version == api_version and c.kind == kind:
-                clazz = c
-                break
-        if not clazz and default is throw_exception:
-            raise ResourceTypeNotFound(kind, namespaced)
+        if not self._class_by_api_version_kind:
+            await self.initialize()
+        clazz = self._class_by_api_version_kind.get((namespaced, api_version, kind))
+        if not clazz:
+            if default is throw_exception:
+                raise ResourceTypeNotFound(kind, namespaced)
+            return default
         return clazz
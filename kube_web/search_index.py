@@ -0,0 +1,196 @@
+"""
+Optional in-memory search index.
+
+The index is built in the background for the configured resource types in all clusters,
+i.e. the search page can answer queries for these types from memory instead of doing one LIST
+per resource type and cluster.
+"""
+import asyncio
+import collections
+import logging
+import time
+from functools import partial
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Set
+from typing import Tuple
+
+import pykube
+from pykube.objects import NamespacedAPIObject
+
+from kube_web.selector import selector_matches
+from kube_web.table import add_label_columns
+from kube_web.table import filter_table_by_predicate
+from kube_web.table import get_search_text
+
+logger = logging.getLogger(__name__)
+
+
+def get_trigrams(text: str) -> Set[str]:
+    """Return all substrings of length 3 (texts shorter than 3 characters have no trigrams)."""
+    return set(map("".join, zip(text, text[1:], text[2:])))
+
+
+class IndexedResourceType:
+
+    """Search index for all objects of one resource type in one cluster."""
+
+    def __init__(self, clazz, table):
+        self.clazz = clazz
+        self.namespaced = issubclass(clazz, NamespacedAPIObject)
+        self.timestamp = time.time()
+        self.documents: List[dict] = []
+        # trigram -> indices of documents containing the trigram
+        self.postings: Dict[str, Set[int]] = collections.defaultdict(set)
+
+        name_column = 0
+        for i, col in enumerate(table.columns):
+            if col["name"] == "Name":
+                name_column = i
+                break
+
+        # same text as matched by filter_table(.., match_labels=True)
+        search_texts = [get_search_text(row, match_labels=True) for row in table.rows]
+        # the search page shows matches in the label column, too
+        add_label_columns(table, "*")
+        for i, (row, search_text) in enumerate(zip(table.rows, search_texts)):
+            metadata = row["object"]["metadata"]
+            self.documents.append(
+                {
+                    "name": row["cells"][name_column],
+                    "namespace": metadata.get("namespace"),
+                    "labels": metadata.get("labels", {}),
+                    "created": metadata["creationTimestamp"],
+                    "cells": row["cells"],
+                    # lowercase cells to extract match snippets
+                    "cells_lower": [str(cell).lower() for cell in row["cells"]],
+                    "search_text": search_text,
+                }
+            )
+            # trigrams spanning two cells contain the separator, i.e. they never match a query
+            for trigram in get_trigrams(search_text):
+                self.postings[trigram].add(i)
+
+    def get_candidates(self, text: str) -> Optional[Set[int]]:
+        """Return indices of documents which might contain the text (None means all documents)."""
+        candidates = None
+        # start with the rarest trigram to keep the intermediate sets small
+        for trigram in sorted(
+            get_trigrams(text), key=lambda t: len(self.postings.get(t, ()))
+        ):
+            postings = self.postings.get(trigram)
+            if not postings:
+                return set()
+            candidates = set(postings) if candidates is None else candidates & postings
+            if not candidates:
+                break
+        return candidates
+
+    def search(self, selector: dict, filter_query: str, namespace: Optional[str]):
+        """Return matching documents, same semantics as filter_table with match_labels=True."""
+        texts = [part.strip().lower() for part in filter_query.split(",")]
+        candidates = None
+        for text in texts:
+            indices = self.get_candidates(text)
+            if indices is not None:
+                candidates = indices if candidates is None else candidates & indices
+        if candidates is None:
+            candidates = range(len(self.documents))
+        for i in sorted(candidates):
+            document = self.documents[i]
+            if self.namespaced and namespace and document["namespace"] != namespace:
+                continue
+            if selector and not selector_matches(selector, document["labels"]):
+                continue
+            # the index only finds candidates, e.g. a text with spaces must appear in one cell
+            if all(text in document["search_text"] for text in texts):
+                yield document
+
+
+class SearchIndex:
+    def __init__(
+        self,
+        cluster_manager,
+        resource_types: list,
+        refresh_interval: float,
+        max_concurrency: int,
+        is_row_allowed,
+    ):
+        self.cluster_manager = cluster_manager
+        self.resource_types = resource_types
+        self.refresh_interval = refresh_interval
+        self.max_concurrency = max_concurrency
+        # predicate to exclude rows of not allowed namespaces
+        self.is_row_allowed = is_row_allowed
+        self._indexes: Dict[Tuple[str, str], IndexedResourceType] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self):
+        if not self._task:
+            self._task = asyncio.create_task(self.run())
+
+    def stop(self):
+        if self._task:
+            self._task.cancel()
+            self._task = None
+
+    def get(
+        self, cluster_name: str, resource_type: str
+    ) -> Optional[IndexedResourceType]:
+        return self._indexes.get((cluster_name, resource_type))
+
+    async def index_resource_type(self, semaphore, cluster, resource_type: str):
+        key = (cluster.name, resource_type)
+        async with semaphore:
+            try:
+                clazz = await cluster.resource_registry.get_class_by_plural_name(
+                    resource_type, namespaced=None
+                )
+                query = clazz.objects(cluster.api)
+                if issubclass(clazz, NamespacedAPIObject):
+                    query = query.filter(namespace=pykube.all)
+                table = await cluster.informer_cache.get_table(query)
+                if table.rows is None:
+                    table.obj["rows"] = []
+                filter_table_by_predicate(
+                    table, partial(self.is_row_allowed, api_obj_class=clazz)
+                )
+                self._indexes[key] = IndexedResourceType(clazz, table)
+            except Exception as e:
+                logger.warning(
+                    f"Failed to index {resource_type} in cluster {cluster.name}: {e}"
+                )
+                # do not serve outdated results, the search will query the cluster
+                self._indexes.pop(key, None)
+
+    async def refresh(self):
+        clusters = self.cluster_manager.clusters
+        start = time.time()
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        await asyncio.gather(
+            *[
+                self.index_resource_type(semaphore, cluster, resource_type)
+                for cluster in clusters
+                for resource_type in self.resource_types
+            ]
+        )
+        cluster_names = set(cluster.name for cluster in clusters)
+        for key in list(self._indexes.keys()):
+            if key[0] not in cluster_names:
+                # cluster was removed
+                del self._indexes[key]
+        duration = time.time() - start
+        logger.info(
+            f"Indexed {len(self.resource_types)} resource types in {len(clusters)} clusters in {duration:.3f} seconds"
+        )
+
+    async def run(self):
+        while True:
+            try:
+                await self.refresh()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Failed to refresh search index: {e}")
+            await asyncio.sleep(self.refresh_interval)
@@ -1,4 +1,6 @@
 import collections
+import heapq
+import itertools
 from functools import partial
 
 
@@ -10,9 +12,8 @@ def _column(row, column_index: int):
     return (row["cells"][column_index], row["cells"][0])
 
 
-def sort_table(table, sort_param):
-    if not sort_param:
-        return
+def _get_sort_key(table, sort_param):
+    """Return key function and "reverse" flag to sort table rows by the given "sort" query parameter."""
     parts = sort_param.split(":")
     sort = parts[0]
     reverse = len(parts) > 1 and parts[1] == "desc"
@@ -28,7 +29,23 @@ def sort_table(table, sort_param):
                 column_index = i
                 break
         key = partial(_column, column_index=column_index)
-    table.rows.sort(key=key, reverse=reverse)
+    return key, reverse
+
+
+def sort_table(table, sort_param, limit: int = None):
+    """Sort table rows, only the first "limit" rows are kept (if given)."""
+    if not sort_param:
+        return
+    key, reverse = _get_sort_key(table, sort_param)
+    if limit and limit < len(table.rows):
+        # top-k selection with a bounded heap instead of sorting all rows,
+        # both are stable, i.e. equivalent to sorted(..)[:limit]
+        if reverse:
+            table.rows[:] = heapq.nlargest(limit, table.rows, key=key)
+        else:
+            table.rows[:] = heapq.nsmallest(limit, table.rows, key=key)
+    else:
+        table.rows.sort(key=key, reverse=reverse)
 
 
 def add_label_columns(table, label_columns_param):
@@ -51,23 +68,32 @@ def add_label_columns(table, label_columns_param):
             },
         )
     for row in table.rows:
-        for i, label in enumerate(label_columns):
+        labels = row["object"]["metadata"].get("labels", {})
+        contents = []
+        for label in label_columns:
             if label == "*":
-                contents = ",".join(
-                    f"{k}={v}"
-                    for k, v in sorted(
-                        row["object"]["metadata"].get("labels", {}).items()
-                    )
-                )
+                contents.append(",".join(f"{k}={v}" for k, v in sorted(labels.items())))
             else:
-                contents = row["object"]["metadata"].get("labels", {}).get(label, "")
-            row["cells"].insert(i + 1, contents)
+                contents.append(labels.get(label, ""))
+        # insert all label cells at once (after the "Name" cell)
+        row["cells"][1:1] = contents
 
 
 def filter_table_by_predicate(table, predicate):
-    for i in range(len(table.rows) - 1, -1, -1):
-        if not predicate(table.rows[i]):
-            del table.rows[i]
+    # rebuild the row list in one pass instead of deleting rows one by one
+    table.rows[:] = [row for row in table.rows if predicate(row)]
+
+
+# separates cells in the search text, i.e. text filters cannot match across cells
+SEARCH_TEXT_SEPARATOR = "\0"
+
+
+def get_search_text(row, match_labels=False) -> str:
+    """Return normalized (lowercase) text of all row cells (and label values) for text filters."""
+    texts = [str(cell) for cell in row["cells"]]
+    if match_labels:
+        texts.extend(row["object"]["metadata"].get("labels", {}).values())
+    return SEARCH_TEXT_SEPARATOR.join(texts).lower()
 
 
 def filter_table(table, filter_param, match_labels=False):
@@ -108,37 +134,22 @@ def filter_table(table, filter_param, match_labels=False):
         table.rows[:] = []
         return
 
-    for i, row in reversed(list(enumerate(table.rows))):
-        is_match = False
-        for j, cell in enumerate(row["cells"]):
-            filter_value = index_filter.get(j)
-            is_match = filter_value is None or str(cell) == filter_value
-            if not is_match:
-                break
-
-            filter_values = index_filter_neq.get(j)
-            is_match = not filter_values or str(cell) not in filter_values
-            if not is_match:
-                break
-
-        if is_match:
+    def is_match(row):
+        cells = row["cells"]
+        for j, filter_value in index_filter.items():
+            if j < len(cells) and str(cells[j]) != filter_value:
+                return False
+        for j, filter_values in index_filter_neq.items():
+            if j < len(cells) and str(cells[j]) in filter_values:
+                return False
+        if text_filters:
+            search_text = get_search_text(row, match_labels)
             for text in text_filters:
-                is_match = False
-                for cell in row["cells"]:
-                    if text in str(cell).lower():
-                        is_match = True
-                        break
-
-                if not is_match and match_labels:
-                    for label_value in (
-                        row["object"]["metadata"].get("labels", {}).values()
-                    ):
-                        if text in label_value.lower():
-                            is_match = True
-                            break
+                if text not in search_text:
+                    return False
+        return True
 
-        if not is_match:
-            del table.rows[i]
+    table.rows[:] = [row for row in table.rows if is_match(row)]
 
 
 def merge_cluster_tables(t1, t2):
@@ -159,8 +170,7 @@ def merge_cluster_tables(t1, t2):
         for i, column in enumerate(t1.columns):
             column_indicies[column["name"]] = i
         for row in t1.rows:
-            for _ in range(added):
-                row["cells"].append(None)
+            row["cells"].extend([None] * added)
         for row in t2.rows:
             new_row_cells = [None] * len(t1.columns)
             for name, cell in zip(column_names2, row["cells"]):
@@ -173,6 +183,33 @@ def merge_cluster_tables(t1, t2):
         return t1
 
 
+def merge_sorted_cluster_tables(tables: list, sort_param, limit: int = None):
+    """
+    Merge tables of the same resource type from different clusters.
+
+    Every table must already be sorted (sort_table), the sorted rows are combined
+    with a k-way merge (and only the first "limit" rows are kept) instead of sorting all rows again.
+    Unsorted tables are only concatenated, i.e. the limit applies per cluster.
+    """
+    merged = tables[0]
+    boundaries = [len(merged.rows)]
+    for table in tables[1:]:
+        merge_cluster_tables(merged, table)
+        boundaries.append(len(merged.rows))
+    if sort_param and len(tables) > 1:
+        key, reverse = _get_sort_key(merged, sort_param)
+        sorted_parts = []
+        start = 0
+        for end in boundaries:
+            sorted_parts.append(merged.rows[start:end])
+            start = end
+        rows = heapq.merge(*sorted_parts, key=key, reverse=reverse)
+        if limit:
+            rows = itertools.islice(rows, limit)
+        merged.rows[:] = list(rows)
+    return merged
+
+
 def guess_column_classes(table):
     for row in table.rows:
         for i, value in enumerate(row["cells"]):
@@ -188,16 +225,20 @@ def remove_columns(table, hide_columns_param):
     hide_columns = frozenset(
         filter(None, [l.strip() for l in hide_columns_param.split(",")])
     )
-    remove_indices = []
+    remove_indices = set()
     for i, column in enumerate(table.columns):
         if column["name"] in hide_columns or "*" in hide_columns:
-            remove_indices.append(i)
+            remove_indices.add(i)
 
-    remove_indices.reverse()
+    if not remove_indices:
+        return
 
-    for i in remove_indices:
-        del table.columns[i]
+    table.columns[:] = [
+        column for i, column in enumerate(table.columns) if i not in remove_indices
+    ]
 
+    # rebuild cells in one pass per row instead of deleting cell by cell
     for row in table.rows:
-        for i in remove_indices:
-            del row["cells"][i]
+        row["cells"][:] = [
+            cell for i, cell in enumerate(row["cells"]) if i not in remove_indices
+        ]
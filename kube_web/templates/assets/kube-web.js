@@ -92,4 +92,32 @@ document.addEventListener('DOMContentLoaded', () => {
     });
   }
 
+  const $searchResults = document.getElementById('search-results');
+  if ($searchResults && $searchResults.dataset.streamUrl) {
+    // results are ranked by the server, each result comes with its position in the list
+    const source = new EventSource($searchResults.dataset.streamUrl);
+    source.addEventListener('results', event => {
+      JSON.parse(event.data).forEach( result => {
+        const $template = document.createElement('template');
+        $template.innerHTML = result.html.trim();
+        $searchResults.insertBefore($template.content.firstChild, $searchResults.children[result.index] || null);
+      });
+    });
+    source.addEventListener('errors', event => {
+      document.getElementById('search-errors').insertAdjacentHTML('beforeend', JSON.parse(event.data));
+    });
+    source.addEventListener('pending', event => {
+      const clusters = JSON.parse(event.data);
+      document.getElementById('search-pending').textContent = clusters.length ? 'Pending: ' + clusters.join(', ') : '';
+    });
+    source.addEventListener('done', event => {
+      // do not let the browser reconnect
+      source.close();
+      document.getElementById('search-summary').innerHTML = JSON.parse(event.data);
+    });
+    source.addEventListener('error', () => {
+      source.close();
+    });
+  }
+
 });
@@ -1,8 +1,10 @@
 import asyncio
 import base64
+import bisect
 import collections
 import colorsys
 import csv
+import json
 import logging
 import os
 import time
@@ -10,6 +12,7 @@ import zlib
 from functools import partial
 from http import HTTPStatus
 from pathlib import Path
+from typing import Dict
 from typing import List
 from typing import Optional
 from typing import Tuple
@@ -35,18 +38,23 @@ from pykube.objects import Pod
 from pykube.query import Query
 from yarl import URL
 
+from .cache import get_token_key
+from .cache import TTLCache
 from .cluster_manager import ClusterNotFound
+from .informer import parse_simple_selector
 from .resource_registry import ResourceTypeNotFound
+from .search_index import SearchIndex
 from .selector import parse_selector
 from .selector import selector_matches
 from .table import add_label_columns
 from .table import filter_table
 from .table import filter_table_by_predicate
 from .table import guess_column_classes
-from .table import merge_cluster_tables
+from .table import merge_sorted_cluster_tables
 from .table import remove_columns
 from .table import sort_table
 from kube_web import __version__
+from kube_web import async_http
 from kube_web import jinja2_filters
 from kube_web import joins
 from kube_web import kubernetes
@@ -63,6 +71,9 @@ OAUTH2_CALLBACK_PATH = "/oauth2/callback"
 CLUSTER_MANAGER = "cluster_manager"
 CONFIG = "config"
 THEME_SETTINGS = "theme_settings"
+NAMESPACE_CACHE = "namespace_cache"
+PREWARM_STATUS = "prewarm_status"
+SEARCH_INDEX = "search_index"
 
 ALL = "_all"
 ALL_CONTAINER_LOGS = ""
@@ -100,6 +111,9 @@ SEARCH_OFFERED_RESOURCE_TYPES = [
 
 SEARCH_MATCH_CONTEXT_LENGTH = 20
 
+# field selectors in search queries (e.g. "metadata.name=foo") which are supported by all resource types
+SEARCH_FIELD_SELECTOR_KEYS = frozenset(["metadata.name", "metadata.namespace"])
+
 
 TABLE_CELL_FORMATTING = {
     "events": {
@@ -175,12 +189,27 @@ class HTTPClientWithAccessToken(HTTPClient):
         self._base_api = base
         self._access_token = access_token
 
-    def get(self, *args, **kwargs):
+    @property
+    def access_token(self):
+        return self._access_token
+
+    @property
+    def config(self):
+        return self._base_api.config
+
+    @property
+    def session(self):
+        return self._base_api.session
+
+    def get_kwargs(self, **kwargs):
+        kwargs = self._base_api.get_kwargs(**kwargs)
         kwargs["auth"] = None
-        if "headers" not in kwargs:
-            kwargs["headers"] = {}
+        kwargs["headers"] = dict(kwargs.get("headers") or {})
         kwargs["headers"]["Authorization"] = f"Bearer {self._access_token}"
-        return self._base_api.get(*args, **kwargs)
+        return kwargs
+
+    def get(self, *args, **kwargs):
+        return self.session.get(*args, **self.get_kwargs(**kwargs))
 
 
 def wrap_query(query: Query, request, session):
@@ -190,6 +219,26 @@ def wrap_query(query: Query, request, session):
     return query
 
 
+class ClusterTimeout(Exception):
+    def __init__(self, cluster, timeout):
+        self.cluster = cluster
+        self.timeout = timeout
+
+    def __str__(self):
+        return f"Cluster {self.cluster} did not respond within {self.timeout} seconds"
+
+
+async def with_cluster_deadline(request, _cluster, coro):
+    """Await API calls to one cluster and cancel them if the cluster does not respond in time."""
+    timeout = request.app[CONFIG].cluster_timeout
+    if not timeout:
+        return await coro
+    try:
+        return await asyncio.wait_for(coro, timeout)
+    except asyncio.TimeoutError:
+        raise ClusterTimeout(_cluster.name, timeout)
+
+
 def get_clusters(request, cluster: str):
     is_all_clusters = not bool(cluster) or cluster == ALL
     if is_all_clusters:
@@ -231,16 +280,10 @@ async def build_sidebar_menu(
         links = []
         for resource_type in resource_types:
             _cluster = clusters[0]
-            if namespace:
-                clazz = await _cluster.resource_registry.get_class_by_plural_name(
-                    resource_type, namespaced=True, default=None
-                )
-            else:
-                clazz = None
-            if not clazz:
-                clazz = await _cluster.resource_registry.get_class_by_plural_name(
-                    resource_type, namespaced=False, default=None
-                )
+            # cluster-scoped types only if no namespace is selected
+            clazz = await _cluster.resource_registry.get_class_by_plural_name(
+                resource_type, namespaced=None if namespace else False, default=None
+            )
             if clazz:
                 if issubclass(clazz, NamespacedAPIObject):
                     path = (
@@ -312,6 +355,21 @@ def get_and_validate_namespace_parameter(request):
     return namespace
 
 
+async def get_namespaces(cluster, request, session):
+    """Return all Namespace objects of the cluster (potentially cached)."""
+    query = wrap_query(Namespace.objects(cluster.api), request, session)
+    fetch = partial(cluster.informer_cache.get_list, query)
+    cache = request.app[NAMESPACE_CACHE]
+    if not cache:
+        return await fetch()
+    if request.app[CONFIG].cluster_auth_use_session_token:
+        # users might have different permissions
+        key = (cluster.name, get_token_key(session.get("access_token")))
+    else:
+        key = (cluster.name, None)
+    return list(await cache.get(key, fetch))
+
+
 def context():
     def decorator(func):
         async def func_wrapper(request):
@@ -330,8 +388,8 @@ def context():
                 if not is_all_clusters and len(clusters) == 1:
                     cluster = clusters[0]
                     try:
-                        namespaces = await kubernetes.get_list(
-                            wrap_query(Namespace.objects(cluster.api), request, session)
+                        namespaces = await with_cluster_deadline(
+                            request, cluster, get_namespaces(cluster, request, session)
                         )
                     except Exception as e:
                         # access might be restricted to selected namespaces
@@ -410,8 +468,8 @@ async def get_cluster_list(request, session):
 @context()
 async def get_cluster(request, session):
     cluster = request.app[CLUSTER_MANAGER].get(request.match_info["cluster"])
-    namespaces = await kubernetes.get_list(
-        wrap_query(Namespace.objects(cluster.api), request, session)
+    namespaces = await with_cluster_deadline(
+        request, cluster, get_namespaces(cluster, request, session)
     )
     resource_types = await cluster.resource_registry.cluster_resource_types
     return {
@@ -473,6 +531,78 @@ async def get_cluster_resource_types(request, session):
     }
 
 
+def _prepare_table(table, _type: str, params: dict, config):
+    """Prepare Table rows and columns before joins (hide columns, add label columns)."""
+    # table.rows might be None, e.g. for "csinodes"
+    if table.rows is None:
+        table.obj["rows"] = []
+
+    # optionally hide any or all columns (before we add label/custom columns)
+    hidden_columns = params.get(qp.HIDDEN_COLUMNS) or config.default_hidden_columns.get(
+        _type
+    )
+    remove_columns(table, hidden_columns)
+
+    label_columns = params.get(qp.LABEL_COLUMNS) or config.default_label_columns.get(
+        _type
+    )
+    add_label_columns(table, label_columns)
+
+
+def _filter_table_rows(table, params: dict, config):
+    """Remove rows from Table which are not allowed or do not match the "filter" query parameter."""
+    filter_table_by_predicate(
+        table,
+        partial(
+            is_row_in_allowed_namespace,
+            api_obj_class=table.api_obj_class,
+            include_namespaces=config.include_namespaces,
+            exclude_namespaces=config.exclude_namespaces,
+        ),
+    )
+    filter_table(table, params.get(qp.FILTER))
+
+
+async def _get_filtered_table_in_chunks(
+    _cluster, query, _type: str, params: dict, config
+):
+    """
+    LIST objects in chunks and only keep rows matching the filter.
+
+    This caps the memory needed for filtering large collections to one chunk (plus the matching rows).
+    """
+    limit = params.get(qp.LIMIT)
+    # the first N matching rows are enough if we don't need to sort
+    enough_rows = int(limit) if limit and not params.get(qp.SORT) else None
+    table = None
+    try:
+        async for chunk in _cluster.informer_cache.iter_table_chunks(
+            query, kubernetes.LIST_CHUNK_SIZE
+        ):
+            _prepare_table(chunk, _type, params, config)
+            _filter_table_rows(chunk, params, config)
+            if table is None:
+                table = chunk
+            else:
+                table.rows.extend(chunk.rows)
+            if enough_rows and len(table.rows) >= enough_rows:
+                break
+    except requests.exceptions.HTTPError as e:
+        if e.response is None or e.response.status_code != 410:
+            raise
+        # the continue token expired (410 Gone) while iterating, LIST everything at once
+        logger.info(f"Continue token for {_type} in {_cluster.name} expired: {e}")
+        table = await _cluster.informer_cache.get_table(query)
+        _prepare_table(table, _type, params, config)
+        _filter_table_rows(table, params, config)
+    # the continue token is not valid for the filtered result,
+    # do not modify the metadata dict as it is shared with other callers (single flight)
+    table.obj["metadata"] = {
+        k: v for k, v in (table.obj.get("metadata") or {}).items() if k != "continue"
+    }
+    return table
+
+
 async def do_get_resource_list(
     request,
     session,
@@ -481,9 +611,61 @@ async def do_get_resource_list(
     namespace: str,
     is_all_namespaces: bool,
     params: dict,
+    continue_token: str = None,
+):
+    """Query cluster resources and return a Table object or error (also if the cluster deadline is reached)."""
+    try:
+        return await with_cluster_deadline(
+            request,
+            _cluster,
+            _do_get_resource_list(
+                request,
+                session,
+                _type,
+                _cluster,
+                namespace,
+                is_all_namespaces,
+                params,
+                continue_token,
+            ),
+        )
+    except ClusterTimeout as e:
+        logger.debug(f"Failed to list {_type} in {_cluster.name}: {e}")
+        return None, None, {"cluster": _cluster, "resource_type": _type, "exception": e}
+
+
+async def _do_get_resource_list(
+    request,
+    session,
+    _type: str,
+    _cluster,
+    namespace: str,
+    is_all_namespaces: bool,
+    params: dict,
+    continue_token: str = None,
 ):
     """Query cluster resources and return a Table object or error."""
     clazz = table = error = None
+    config = request.app[CONFIG]
+    limit = params.get(qp.LIMIT)
+    api_params = {}
+    if limit and not params.get(qp.FILTER) and not params.get(qp.SORT):
+        # we don't need the full collection for filtering or sorting,
+        # so let the API server return only one page ("chunk")
+        api_params["limit"] = int(limit)
+        if continue_token:
+            api_params["continue"] = continue_token
+    custom_columns = params.get(qp.CUSTOM_COLUMNS) or config.default_custom_columns.get(
+        _type
+    )
+    if custom_columns:
+        # get full objects to evaluate the custom columns without a second LIST
+        api_params["includeObject"] = "Object"
+    # filters on plain Table/label columns can be applied chunk by chunk,
+    # joined columns need the whole collection
+    filter_in_chunks = (
+        params.get(qp.FILTER) and not params.get(qp.JOIN) and not custom_columns
+    )
     try:
         clazz = await _cluster.resource_registry.get_class_by_plural_name(
             _type, namespaced=namespace is not None
@@ -497,68 +679,48 @@ async def do_get_resource_list(
         if params.get(qp.SELECTOR):
             query = query.filter(selector=params[qp.SELECTOR])
 
-        table = await kubernetes.get_table(query)
+        if filter_in_chunks:
+            table = await _get_filtered_table_in_chunks(
+                _cluster, query, _type, params, config
+            )
+        else:
+            table = await _cluster.informer_cache.get_table(query, api_params)
     except Exception as e:
         # just log as DEBUG because the error is shown in the web frontend already
         logger.debug(f"Failed to list {_type} in {_cluster.name}: {e}")
         error = {"cluster": _cluster, "resource_type": _type, "exception": e}
     else:
-        config = request.app[CONFIG]
-        # table.rows might be None, e.g. for "csinodes"
-        if table.rows is None:
-            table.obj["rows"] = []
-
-        # optionally hide any or all columns (before we add label/custom columns)
-        hidden_columns = params.get(
-            qp.HIDDEN_COLUMNS
-        ) or config.default_hidden_columns.get(_type)
-        remove_columns(table, hidden_columns)
-
-        label_columns = params.get(
-            qp.LABEL_COLUMNS
-        ) or config.default_label_columns.get(_type)
-        add_label_columns(table, label_columns)
-
-        # note: we join before sorting, so sorting works on the joined columns, too
-        if params.get(qp.JOIN) == "metrics" and _type in ("pods", "nodes"):
-            await joins.join_metrics(
-                partial(wrap_query, request=request, session=session),
-                _cluster,
-                table,
-                namespace,
-                is_all_namespaces,
-                params,
-            )
+        if not filter_in_chunks:
+            _prepare_table(table, _type, params, config)
 
-        custom_columns = params.get(
-            qp.CUSTOM_COLUMNS
-        ) or config.default_custom_columns.get(_type)
-        if custom_columns:
-            await joins.join_custom_columns(
-                partial(wrap_query, request=request, session=session),
-                _cluster,
-                table,
-                namespace,
-                is_all_namespaces,
-                custom_columns,
-                params,
-                request.app[CONFIG],
-            )
+            # note: we join before sorting, so sorting works on the joined columns, too
+            if params.get(qp.JOIN) == "metrics" and _type in ("pods", "nodes"):
+                await joins.join_metrics(
+                    partial(wrap_query, request=request, session=session),
+                    _cluster,
+                    table,
+                    namespace,
+                    is_all_namespaces,
+                    params,
+                )
+
+            if custom_columns:
+                await joins.join_custom_columns(
+                    partial(wrap_query, request=request, session=session),
+                    _cluster,
+                    table,
+                    namespace,
+                    is_all_namespaces,
+                    custom_columns,
+                    params,
+                    config,
+                )
+
+            _filter_table_rows(table, params, config)
 
-        filter_table_by_predicate(
-            table,
-            partial(
-                is_row_in_allowed_namespace,
-                api_obj_class=table.api_obj_class,
-                include_namespaces=request.app[CONFIG].include_namespaces,
-                exclude_namespaces=request.app[CONFIG].exclude_namespaces,
-            ),
-        )
-        filter_table(table, params.get(qp.FILTER))
         guess_column_classes(table)
-        sort_table(table, params.get(qp.SORT))
+        sort_table(table, params.get(qp.SORT), int(limit) if limit else None)
 
-        limit = params.get(qp.LIMIT)
         if limit:
             table.rows[:] = table.rows[: int(limit)]  # type: ignore
 
@@ -678,6 +840,12 @@ async def get_resource_list(request, session):
 
     start = time.time()
     params = request.rel_url.query
+    # continue tokens (pagination) are only valid for a single resource type in a single cluster
+    is_paginated = len(resource_types) == 1 and len(clusters) == 1
+    if is_paginated:
+        continue_token = params.get(qp.CONTINUE)
+    else:
+        continue_token = None
     tasks = []
     for _type in resource_types:
         for _cluster in clusters:
@@ -690,12 +858,12 @@ async def get_resource_list(request, session):
                     namespace,
                     is_all_namespaces,
                     params,
+                    continue_token,
                 )
             )
             tasks.append(task)
 
-    tables = []
-    tables_by_resource_type = {}
+    tables_by_resource_type: Dict[str, list] = {}
     errors_by_cluster = collections.defaultdict(list)
     for _clazz, table, error in await asyncio.gather(*tasks):
         if error:
@@ -704,20 +872,25 @@ async def get_resource_list(request, session):
                 raise error["exception"]
             errors_by_cluster[error["cluster"].name].append(error)
         else:
-            previous_table = tables_by_resource_type.get(table.api_obj_class.endpoint)
-            if previous_table:
-                merged = merge_cluster_tables(previous_table, table)
-                if merged:
-                    # sort again after merge
-                    sort_table(merged, params.get(qp.SORT))
-                else:
-                    tables.append(table)
-            else:
-                tables_by_resource_type[table.api_obj_class.endpoint] = table
-                tables.append(table)
+            tables_by_resource_type.setdefault(table.api_obj_class.endpoint, []).append(
+                table
+            )
+
+    limit = params.get(qp.LIMIT)
+    # every cluster table is already sorted
+    tables = [
+        merge_sorted_cluster_tables(
+            cluster_tables, params.get(qp.SORT), int(limit) if limit else None
+        )
+        for cluster_tables in tables_by_resource_type.values()
+    ]
 
     total_rows = sum(len(table.rows) for table in tables)
 
+    next_continue_token = None
+    if is_paginated:
+        next_continue_token = tables[0].obj.get("metadata", {}).get("continue")
+
     duration = time.time() - start
 
     if params.get(qp.DOWNLOAD) == "tsv":
@@ -736,6 +909,7 @@ async def get_resource_list(request, session):
         "list_resource_types": resource_types,
         "list_clusters": clusters,
         "list_total_rows": total_rows,
+        "list_next_continue_token": next_continue_token,
     }
 
 
@@ -819,7 +993,7 @@ async def get_resource_view(request, session):
         if field_selector:
             query = query.filter(field_selector=field_selector)
 
-        table = await kubernetes.get_table(query)
+        table = await cluster.informer_cache.get_table(query)
         guess_column_classes(table)
         sort_table(table, params.get(qp.SORT))
         table.obj["cluster"] = cluster
@@ -969,7 +1143,7 @@ async def get_resource_logs(request, session):
             namespace=namespace,
             selector=resource.obj["spec"]["selector"]["matchLabels"],
         )
-        pods = await kubernetes.get_list(query)
+        pods = await cluster.informer_cache.get_list(query)
     else:
         raise web.HTTPNotFound(text="Resource has no logs")
 
@@ -995,7 +1169,8 @@ async def get_resource_logs(request, session):
                 )
             else:
                 # show logs for all containers
-                containers = pod.obj["spec"]["containers"]
+                # note: do not modify the (potentially shared/cached) pod object
+                containers = list(pod.obj["spec"]["containers"])
 
                 if "initContainers" in pod.obj["spec"]:
                     containers += pod.obj["spec"]["initContainers"]
@@ -1024,10 +1199,144 @@ async def get_resource_logs(request, session):
     }
 
 
+def get_search_matches(
+    cells, filter_query: str, cells_lower: list = None
+) -> List[Tuple[str, str, str]]:
+    """Return up to three text snippets (before, match, after) of cells matching the query."""
+    filter_query_lower = filter_query.lower()
+    if cells_lower is None:
+        cells_lower = [str(cell).lower() for cell in cells]
+    matches = []
+    for cell, cell_lower in zip(cells, cells_lower):
+        idx = cell_lower.find(filter_query_lower)
+        if idx > -1:
+            pre_start = max(idx - SEARCH_MATCH_CONTEXT_LENGTH, 0)
+            end = idx + len(filter_query_lower)
+            post_end = min(
+                idx + len(filter_query_lower) + SEARCH_MATCH_CONTEXT_LENGTH, len(cell),
+            )
+            matches.append((cell[pre_start:idx], cell[idx:end], cell[end:post_end]))
+            if len(matches) >= 3:
+                break
+    return matches
+
+
+def get_search_result(
+    _cluster,
+    _type: str,
+    clazz,
+    name: str,
+    namespace: Optional[str],
+    cells: list,
+    labels: dict,
+    created: str,
+    filter_query: str,
+    cells_lower: list = None,
+) -> dict:
+    if namespace:
+        link = f"/clusters/{_cluster.name}/namespaces/{namespace}/{_type}/{name}"
+    else:
+        link = f"/clusters/{_cluster.name}/{_type}/{name}"
+    return {
+        "title": name,
+        "kind": clazz.kind,
+        "link": link,
+        "matches": get_search_matches(cells, filter_query, cells_lower)
+        if filter_query
+        else [],
+        "labels": labels,
+        "created": created,
+    }
+
+
+async def search_in_index(
+    indexed,
+    selector: dict,
+    field_selector: dict,
+    filter_query: str,
+    _type: str,
+    _cluster,
+    namespace: str,
+    is_all_namespaces: bool,
+):
+    """Search objects of one resource type in the in-memory search index."""
+    results = []
+    query_namespace, can_match = plan_search_namespace(
+        indexed.namespaced, field_selector, namespace, is_all_namespaces
+    )
+    # without a search query, only return the clazz
+    if (selector or field_selector or filter_query) and can_match:
+        name = field_selector.get("metadata.name")
+        for document in indexed.search(
+            selector,
+            filter_query,
+            None if query_namespace is pykube.all else query_namespace,
+        ):
+            if name is not None and document["name"] != name:
+                continue
+            results.append(
+                get_search_result(
+                    _cluster,
+                    _type,
+                    indexed.clazz,
+                    document["name"],
+                    document["namespace"] if indexed.namespaced else None,
+                    document["cells"],
+                    document["labels"],
+                    document["created"],
+                    filter_query,
+                    document["cells_lower"],
+                )
+            )
+    return indexed.clazz, results, []
+
+
+def parse_search_query(search_query: str) -> Tuple[str, dict, str]:
+    """Split the search query into label selector, field selector, and residual filter text.
+
+    >>> parse_search_query("app=foo metadata.namespace=default nginx")
+    ('app=foo', {'metadata.namespace': 'default'}, 'nginx')
+    """
+    # k=v pairs in query will be changed to selector automatically
+    selector_words = []
+    field_selector = {}
+    filter_words = []
+    for word in search_query.split():
+        key, sep, value = word.partition("=")
+        if not sep:
+            filter_words.append(word)
+        elif key in SEARCH_FIELD_SELECTOR_KEYS:
+            field_selector[key] = value
+        else:
+            selector_words.append(word)
+    return ",".join(selector_words), field_selector, " ".join(filter_words)
+
+
+def plan_search_namespace(
+    namespaced: bool, field_selector: dict, namespace: str, is_all_namespaces: bool
+):
+    """Return the namespace to query (pykube.all for all namespaces) and whether any object can match.
+
+    A "metadata.namespace" field selector is evaluated as namespace scope,
+    i.e. the API server only needs to return objects of this namespace.
+    """
+    field_namespace = field_selector.get("metadata.namespace")
+    if not namespaced:
+        # cluster-scoped objects have no namespace
+        return None, field_namespace is None
+    if field_namespace is not None:
+        return (
+            field_namespace,
+            is_all_namespaces or namespace == field_namespace,
+        )
+    return pykube.all if is_all_namespaces else namespace, True
+
+
 async def search(
     request,
     session,
     selector,
+    field_selector,
     filter_query,
     _type,
     _cluster,
@@ -1038,80 +1347,75 @@ async def search(
     results = []
     errors = []
     try:
-        namespaced = True
         clazz = await _cluster.resource_registry.get_class_by_plural_name(
-            _type, namespaced=True, default=None
+            _type, namespaced=None
+        )
+        namespaced = issubclass(clazz, NamespacedAPIObject)
+        query_namespace, can_match = plan_search_namespace(
+            namespaced, field_selector, namespace, is_all_namespaces
         )
-        if not clazz:
-            clazz = await _cluster.resource_registry.get_class_by_plural_name(
-                _type, namespaced=False
-            )
-            namespaced = False
 
         # without a search query, only return the clazz
-        if selector or filter_query:
+        if (selector or field_selector or filter_query) and can_match:
             query = wrap_query(clazz.objects(_cluster.api), request, session)
             if namespaced:
-                query = query.filter(
-                    namespace=pykube.all if is_all_namespaces else namespace
-                )
+                query = query.filter(namespace=query_namespace)
             if selector:
                 query = query.filter(selector=selector)
-
-            table = await kubernetes.get_table(query)
-            filter_table_by_predicate(
-                table,
-                partial(
-                    is_row_in_allowed_namespace,
-                    api_obj_class=table.api_obj_class,
-                    include_namespaces=request.app[CONFIG].include_namespaces,
-                    exclude_namespaces=request.app[CONFIG].exclude_namespaces,
-                ),
+            if "metadata.name" in field_selector:
+                query = query.filter(
+                    field_selector={"metadata.name": field_selector["metadata.name"]}
+                )
+            is_allowed = partial(
+                is_row_in_allowed_namespace,
+                api_obj_class=clazz,
+                include_namespaces=request.app[CONFIG].include_namespaces,
+                exclude_namespaces=request.app[CONFIG].exclude_namespaces,
             )
-            if filter_query:
-                filter_table(table, filter_query, match_labels=True)
-                # add label columns AFTER filtering, so there is less to do
-                add_label_columns(table, "*")
+
+            if not filter_query:
+                # no text to match: object metadata is enough (no Table cells)
+                for metadata in await _cluster.informer_cache.get_metadata_list(query):
+                    if is_allowed({"object": {"metadata": metadata}}):
+                        results.append(
+                            get_search_result(
+                                _cluster,
+                                _type,
+                                clazz,
+                                metadata["name"],
+                                metadata.get("namespace") if namespaced else None,
+                                [],
+                                metadata.get("labels", {}),
+                                metadata["creationTimestamp"],
+                                filter_query,
+                            )
+                        )
+                return clazz, results, errors
+
+            table = await _cluster.informer_cache.get_table(query)
+            filter_table_by_predicate(table, is_allowed)
+            filter_table(table, filter_query, match_labels=True)
+            # add label columns AFTER filtering, so there is less to do
+            add_label_columns(table, "*")
             name_column = 0
             for i, col in enumerate(table.columns):
                 if col["name"] == "Name":
                     name_column = i
                     break
-            filter_query_lower = filter_query.lower()
             for row in table.rows:
-                name = row["cells"][name_column]
-                if namespaced:
-                    ns = row["object"]["metadata"]["namespace"]
-                    link = f"/clusters/{_cluster.name}/namespaces/{ns}/{_type}/{name}"
-                else:
-                    link = f"/clusters/{_cluster.name}/{_type}/{name}"
-                matches = []
-                if filter_query:
-                    for cell in row["cells"]:
-                        idx = str(cell).lower().find(filter_query_lower)
-                        if idx > -1:
-                            pre_start = max(idx - SEARCH_MATCH_CONTEXT_LENGTH, 0)
-                            end = idx + len(filter_query_lower)
-                            post_end = min(
-                                idx
-                                + len(filter_query_lower)
-                                + SEARCH_MATCH_CONTEXT_LENGTH,
-                                len(cell),
-                            )
-                            matches.append(
-                                (cell[pre_start:idx], cell[idx:end], cell[end:post_end])
-                            )
-                            if len(matches) >= 3:
-                                break
+                metadata = row["object"]["metadata"]
                 results.append(
-                    {
-                        "title": name,
-                        "kind": clazz.kind,
-                        "link": link,
-                        "matches": matches,
-                        "labels": row["object"]["metadata"].get("labels", {}),
-                        "created": row["object"]["metadata"]["creationTimestamp"],
-                    }
+                    get_search_result(
+                        _cluster,
+                        _type,
+                        clazz,
+                        row["cells"][name_column],
+                        metadata.get("namespace") if namespaced else None,
+                        row["cells"],
+                        metadata.get("labels", {}),
+                        metadata["creationTimestamp"],
+                        filter_query,
+                    )
                 )
     except Exception as e:
         # just log as DEBUG because the error is shown in the web frontend already
@@ -1126,6 +1430,7 @@ async def bounded_search(
     request,
     session,
     selector,
+    field_selector,
     filter_query,
     _type,
     _cluster,
@@ -1133,16 +1438,29 @@ async def bounded_search(
     is_all_namespaces,
 ):
     async with semaphore:
-        return await search(
-            request,
-            session,
-            selector,
-            filter_query,
-            _type,
-            _cluster,
-            namespace,
-            is_all_namespaces,
-        )
+        try:
+            return await with_cluster_deadline(
+                request,
+                _cluster,
+                search(
+                    request,
+                    session,
+                    selector,
+                    field_selector,
+                    filter_query,
+                    _type,
+                    _cluster,
+                    namespace,
+                    is_all_namespaces,
+                ),
+            )
+        except ClusterTimeout as e:
+            logger.debug(f"Failed to search {_type} in {_cluster.name}: {e}")
+            return (
+                None,
+                [],
+                [{"cluster": _cluster, "resource_type": _type, "exception": e}],
+            )
 
 
 def sort_rank(result, search_query_lower):
@@ -1161,27 +1479,31 @@ def sort_rank(result, search_query_lower):
     return (-score, result["title"], result["kind"], result["link"])
 
 
-@routes.get("/search")
-@aiohttp_jinja2.template("search.html")
-@context()
-async def get_search(request, session):
+def rank_search_results(ranked: list, keys: list, results: list, search_query_lower):
+    """Insert new results into the already ranked results, return the list of (position, result) tuples.
+
+    Positions are relative to the list after inserting all preceding results, i.e. the browser can insert
+    them one after another to keep the same order.
+    """
+    positions = []
+    for result in results:
+        key = sort_rank(result, search_query_lower)
+        position = bisect.bisect_right(keys, key)
+        keys.insert(position, key)
+        ranked.insert(position, result)
+        positions.append((position, result))
+    return positions
+
+
+def parse_search_request(request):
     params = request.rel_url.query
     cluster = ",".join(params.getall("cluster", []))
     namespace = ",".join(params.getall("namespace", []))
     selector = params.get(qp.SELECTOR, "").strip()
     search_query = params.get("q", "").strip()
 
-    # k=v pairs in query will be changed to selector automatically
-    selector_words = []
-    filter_words = []
-    for word in search_query.split():
-        if "=" in word:
-            selector_words.append(word)
-        else:
-            filter_words.append(word)
-
-    selector += ",".join(selector_words)
-    filter_query = " ".join(filter_words)
+    query_selector, field_selector, filter_query = parse_search_query(search_query)
+    selector += query_selector
 
     default_resource_types = (
         request.app[CONFIG].search_default_resource_types
@@ -1198,44 +1520,72 @@ async def get_search(request, session):
 
     is_all_namespaces = not namespace or namespace == ALL
 
-    offered_resource_types = (
-        request.app[CONFIG].search_offered_resource_types
-        or SEARCH_OFFERED_RESOURCE_TYPES
-    )
-    searchable_resource_types = {}
-
-    results = []
-    errors_by_cluster = collections.defaultdict(list)
+    return {
+        "cluster": cluster,
+        "namespace": namespace,
+        "selector": selector,
+        "field_selector": field_selector,
+        "search_query": search_query,
+        "filter_query": filter_query,
+        "resource_types": resource_types,
+        "clusters": clusters,
+        "is_all_clusters": is_all_clusters,
+        "is_all_namespaces": is_all_namespaces,
+    }
 
-    start = time.time()
 
+def create_search_tasks(request, session, search_params):
+    """Return list of (cluster, resource type, task) tuples, one task per resource type and cluster."""
     # limit concurrency in case we have many clusters and search many resource types
     semaphore = asyncio.Semaphore(request.app[CONFIG].search_max_concurrency)
 
-    # snapshot1 = tracemalloc.take_snapshot()
+    search_index = request.app[SEARCH_INDEX]
+    # the search index can only evaluate simple label selectors
+    simple_selector = (
+        parse_simple_selector(search_params["selector"]) if search_index else None
+    )
 
     tasks = []
-
-    search_query_lower = search_query.lower()
-
-    for _type in resource_types:
-        for _cluster in clusters:
-            task = asyncio.create_task(
-                bounded_search(
+    for _type in search_params["resource_types"]:
+        for _cluster in search_params["clusters"]:
+            indexed = (
+                search_index.get(_cluster.name, _type)
+                if simple_selector is not None
+                else None
+            )
+            if indexed:
+                coro = search_in_index(
+                    indexed,
+                    simple_selector,
+                    search_params["field_selector"],
+                    search_params["filter_query"],
+                    _type,
+                    _cluster,
+                    search_params["namespace"],
+                    search_params["is_all_namespaces"],
+                )
+            else:
+                coro = bounded_search(
                     semaphore,
                     request,
                     session,
-                    selector,
-                    filter_query,
+                    search_params["selector"],
+                    search_params["field_selector"],
+                    search_params["filter_query"],
                     _type,
                     _cluster,
-                    namespace,
-                    is_all_namespaces,
+                    search_params["namespace"],
+                    search_params["is_all_namespaces"],
                 )
-            )
-            tasks.append(task)
+            tasks.append((_cluster, _type, asyncio.create_task(coro)))
+    return tasks
 
-    if search_query and is_all_clusters:
+
+def get_cluster_search_results(request, search_params):
+    """Return clusters matching the search query by name or label value."""
+    results = []
+    search_query_lower = search_params["search_query"].lower()
+    if search_query_lower and search_params["is_all_clusters"]:
         for _cluster in request.app[CLUSTER_MANAGER].clusters:
             is_match = search_query_lower in _cluster.name.lower()
             if not is_match:
@@ -1253,27 +1603,20 @@ async def get_search(request, session):
                         "created": None,
                     }
                 )
+    return results
 
-    for clazz, _results, _errors in await asyncio.gather(*tasks):
-        if clazz and clazz.endpoint not in searchable_resource_types:
-            # search was done with a non-standard resource type (e.g. CRD)
-            searchable_resource_types[clazz.endpoint] = clazz.kind
-        results.extend(_results)
-        for error in _errors:
-            errors_by_cluster[error["cluster"].name].append(error)
 
-    for resource_type in offered_resource_types:
+async def add_searchable_resource_types(
+    request, clusters, resource_types, searchable_resource_types
+):
+    for resource_type in resource_types:
         if resource_type not in searchable_resource_types:
             try:
                 for i, _cluster in enumerate(clusters):
                     try:
                         clazz = await _cluster.resource_registry.get_class_by_plural_name(
-                            resource_type, True, default=None
+                            resource_type, namespaced=None
                         )
-                        if not clazz:
-                            clazz = await _cluster.resource_registry.get_class_by_plural_name(
-                                resource_type, False
-                            )
                     except Exception:
                         if i >= len(clusters) - 1:
                             raise
@@ -1285,34 +1628,196 @@ async def get_search(request, session):
                     f"Could not find resource type {resource_type} in one of the clusters: {e}"
                 )
 
-    results.sort(key=partial(sort_rank, search_query_lower=search_query_lower))
-
-    # snapshot2 = tracemalloc.take_snapshot()
-    # top_stats = snapshot2.compare_to(snapshot1, "lineno")
 
-    # print("[ Top 10 differences ]")
-    # for stat in top_stats[:10]:
-    #    print(stat)
+@routes.get("/search")
+@aiohttp_jinja2.template("search.html")
+@context()
+async def get_search(request, session):
+    search_params = parse_search_request(request)
+    clusters = search_params["clusters"]
+    search_query = search_params["search_query"]
 
-    duration = time.time() - start
+    offered_resource_types = (
+        request.app[CONFIG].search_offered_resource_types
+        or SEARCH_OFFERED_RESOURCE_TYPES
+    )
+    searchable_resource_types: Dict[str, str] = {}
 
-    return {
-        "cluster": cluster,
-        "namespace": namespace,
-        "search_results": results,
-        "search_errors": errors_by_cluster,
+    ctx = {
+        "cluster": search_params["cluster"],
+        "namespace": search_params["namespace"],
         "search_query": search_query,
         "search_clusters": clusters,
-        "search_duration": duration,
-        "resource_types": resource_types,
+        "resource_types": search_params["resource_types"],
         "searchable_resource_types": searchable_resource_types,
-        "is_all_clusters": is_all_clusters,
-        "is_all_namespaces": is_all_namespaces,
+        "is_all_clusters": search_params["is_all_clusters"],
+        "is_all_namespaces": search_params["is_all_namespaces"],
+    }
+
+    if (
+        search_query
+        and request.app[CONFIG].search_stream
+        and request.rel_url.query.get("stream") != "0"
+    ):
+        # the browser fetches the results from the event stream
+        ctx["search_stream_url"] = request.rel_url.with_path(
+            "/search/events"
+        ).with_query(request.rel_url.query)
+        await add_searchable_resource_types(
+            request,
+            clusters,
+            list(search_params["resource_types"]) + list(offered_resource_types),
+            searchable_resource_types,
+        )
+        return ctx
+
+    errors_by_cluster = collections.defaultdict(list)
+
+    start = time.time()
+
+    tasks = create_search_tasks(request, session, search_params)
+    results = get_cluster_search_results(request, search_params)
+
+    for clazz, _results, _errors in await asyncio.gather(
+        *[task for _, _, task in tasks]
+    ):
+        if clazz and clazz.endpoint not in searchable_resource_types:
+            # search was done with a non-standard resource type (e.g. CRD)
+            searchable_resource_types[clazz.endpoint] = clazz.kind
+        results.extend(_results)
+        for error in _errors:
+            errors_by_cluster[error["cluster"].name].append(error)
+
+    await add_searchable_resource_types(
+        request, clusters, offered_resource_types, searchable_resource_types
+    )
+
+    results.sort(key=partial(sort_rank, search_query_lower=search_query.lower()))
+
+    duration = time.time() - start
+
+    ctx.update(
+        {
+            "search_results": results,
+            "search_errors": errors_by_cluster,
+            "search_duration": duration,
+        }
+    )
+    return ctx
+
+
+def format_server_sent_event(event: str, data) -> bytes:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n".encode("utf-8")
+
+
+@routes.get("/search/events")
+async def get_search_events(request):
+    """Stream search results as Server-Sent Events while the clusters respond."""
+    session = await get_session(request)
+    search_params = parse_search_request(request)
+    search_query_lower = search_params["search_query"].lower()
+    # links in rendered results point to the search page
+    page_ctx = {
+        "rel_url": request.rel_url.with_path("/search").with_query(
+            request.rel_url.query
+        )
     }
 
+    response = web.StreamResponse()
+    response.content_type = "text/event-stream"
+    response.headers["Cache-Control"] = "no-cache"
+    await response.prepare(request)
+
+    start = time.time()
+    ranked: list = []
+    keys: list = []
+
+    async def send_results(results):
+        data = [
+            {
+                "index": position,
+                "html": aiohttp_jinja2.render_string(
+                    "partials/search-result.html",
+                    request,
+                    dict(page_ctx, result=result),
+                ),
+            }
+            for position, result in rank_search_results(
+                ranked, keys, results, search_query_lower
+            )
+        ]
+        if data:
+            await response.write(format_server_sent_event("results", data))
+
+    async def send_errors(cluster_name, errors):
+        html = aiohttp_jinja2.render_string(
+            "partials/search-errors.html",
+            request,
+            {"search_errors": {cluster_name: errors}},
+        )
+        await response.write(format_server_sent_event("errors", html))
+
+    tasks = create_search_tasks(request, session, search_params)
+    pending_by_cluster: Dict[str, int] = collections.Counter(
+        _cluster.name for _cluster, _, _ in tasks
+    )
+    cluster_by_task = {task: _cluster for _cluster, _, task in tasks}
+
+    try:
+        await send_results(get_cluster_search_results(request, search_params))
+        await response.write(
+            format_server_sent_event("pending", sorted(pending_by_cluster))
+        )
+
+        pending = set(cluster_by_task)
+        while pending:
+            # slow clusters are reported by each task (ClusterTimeout, see --cluster-timeout)
+            done, pending = await asyncio.wait(
+                pending, return_when=asyncio.FIRST_COMPLETED
+            )
+            for task in done:
+                _cluster = cluster_by_task[task]
+                clazz, results, errors = task.result()
+                await send_results(results)
+                if errors:
+                    await send_errors(_cluster.name, errors)
+                pending_by_cluster[_cluster.name] -= 1
+                if not pending_by_cluster[_cluster.name]:
+                    del pending_by_cluster[_cluster.name]
+            await response.write(
+                format_server_sent_event("pending", sorted(pending_by_cluster))
+            )
+
+        duration = time.time() - start
+        await response.write(
+            format_server_sent_event(
+                "done",
+                aiohttp_jinja2.render_string(
+                    "partials/search-summary.html",
+                    request,
+                    dict(
+                        page_ctx,
+                        search_results=ranked,
+                        search_clusters=search_params["clusters"],
+                        search_duration=duration,
+                        resource_types=search_params["resource_types"],
+                    ),
+                ),
+            )
+        )
+    finally:
+        # the browser might have closed the connection
+        for task in cluster_by_task:
+            task.cancel()
+
+    return response
+
 
 @routes.get(HEALTH_PATH)
 async def get_health(request):
+    if not request.app[PREWARM_STATUS]["ready"]:
+        # not ready to serve traffic while resource registries are still being initialized
+        return web.Response(status=503, text="Initializing")
     return web.Response(text="OK")
 
 
@@ -1414,6 +1919,10 @@ async def error_handler(request, handler):
             status = 404
             error_title = "Error: cluster not found"
             error_text = f'Cluster "{e.cluster}" not found'
+        elif isinstance(e, ClusterTimeout):
+            status = 504
+            error_title = "Error: cluster timeout"
+            error_text = str(e)
         elif isinstance(e, ResourceTypeNotFound):
             status = 404
             error_title = "Error: resource type not found"
@@ -1473,6 +1982,61 @@ async def trailing_slash(request, handler):
     return response
 
 
+async def close_http_sessions(app):
+    await async_http.close()
+
+
+async def initialize_resource_registry(cluster, semaphore, timeout: float):
+    async with semaphore:
+        try:
+            await asyncio.wait_for(cluster.resource_registry.initialize(), timeout)
+        except asyncio.TimeoutError:
+            logger.warning(
+                f"Timeout while initializing resource registry for cluster {cluster.name}"
+            )
+        except Exception as e:
+            logger.warning(
+                f"Failed to initialize resource registry for cluster {cluster.name}: {e}"
+            )
+
+
+async def prewarm_resource_registries(app):
+    """Initialize the resource registries of all clusters, i.e. the first page views do not need to wait."""
+    config = app[CONFIG]
+    clusters = app[CLUSTER_MANAGER].clusters
+    start = time.time()
+    semaphore = asyncio.Semaphore(config.prewarm_concurrency)
+    await asyncio.gather(
+        *[
+            initialize_resource_registry(cluster, semaphore, config.prewarm_timeout)
+            for cluster in clusters
+        ]
+    )
+    duration = time.time() - start
+    logger.info(
+        f"Initialized resource registries for {len(clusters)} clusters in {duration:.3f} seconds"
+    )
+    app[PREWARM_STATUS]["ready"] = True
+
+
+async def start_search_index(app):
+    app[SEARCH_INDEX].start()
+
+
+async def stop_search_index(app):
+    app[SEARCH_INDEX].stop()
+
+
+async def start_prewarm(app):
+    app[PREWARM_STATUS]["task"] = asyncio.create_task(prewarm_resource_registries(app))
+
+
+async def stop_prewarm(app):
+    task = app[PREWARM_STATUS].get("task")
+    if task:
+        task.cancel()
+
+
 def get_app(cluster_manager, config):
     templates_paths = [str(Path(__file__).parent / "templates")]
     if config.templates_path:
@@ -1539,5 +2103,39 @@ def get_app(cluster_manager, config):
     app[CLUSTER_MANAGER] = cluster_manager
     app[CONFIG] = config
     app[THEME_SETTINGS] = theme_settings
+    if config.namespace_cache_ttl:
+        # serve stale namespace lists for some more time while refreshing them in the background
+        app[NAMESPACE_CACHE] = TTLCache(
+            config.namespace_cache_ttl,
+            stale_ttl=config.namespace_cache_ttl * 5,
+            name="namespaces",
+        )
+    else:
+        app[NAMESPACE_CACHE] = None
+
+    # the health endpoint reports "not ready" until all resource registries are initialized
+    app[PREWARM_STATUS] = {"ready": not config.prewarm_resource_registries}
+    if config.prewarm_resource_registries:
+        app.on_startup.append(start_prewarm)
+        app.on_cleanup.append(stop_prewarm)
+
+    if config.search_index_resource_types:
+        app[SEARCH_INDEX] = SearchIndex(
+            cluster_manager,
+            config.search_index_resource_types,
+            config.search_index_refresh_interval,
+            config.search_max_concurrency,
+            partial(
+                is_row_in_allowed_namespace,
+                include_namespaces=config.include_namespaces,
+                exclude_namespaces=config.exclude_namespaces,
+            ),
+        )
+        app.on_startup.append(start_search_index)
+        app.on_cleanup.append(stop_search_index)
+    else:
+        app[SEARCH_INDEX] = None
+
+    app.on_cleanup.append(close_http_sessions)
 
     return app
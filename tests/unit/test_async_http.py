@@ -0,0 +1,127 @@
+import asyncio
+
+import requests
+from aiohttp import web
+from pykube import HTTPClient
+from pykube import KubeConfig
+from pykube import Namespace
+
+from kube_web import async_http
+from kube_web import kubernetes
+
+
+async def _with_api_server(handler, func):
+    app = web.Application()
+    app.router.add_get("/{path:.*}", handler)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    try:
+        api = HTTPClient(KubeConfig.from_url(f"http://127.0.0.1:{port}"))
+        return await func(api)
+    finally:
+        await async_http.close()
+        await runner.cleanup()
+
+
+def test_get_list(monkeypatch):
+    monkeypatch.setattr(kubernetes, "use_async_http", True)
+    requests = []
+
+    async def handler(request):
+        requests.append(request)
+        return web.json_response({"items": [{"metadata": {"name": "default"}}]})
+
+    async def func(api):
+        return await kubernetes.get_list(Namespace.objects(api))
+
+    namespaces = asyncio.run(_with_api_server(handler, func))
+    assert [ns.name for ns in namespaces] == ["default"]
+    assert requests[0].path == "/api/v1/namespaces"
+
+
+def test_get_table(monkeypatch):
+    monkeypatch.setattr(kubernetes, "use_async_http", True)
+
+    async def handler(request):
+        assert "as=Table" in request.headers["Accept"]
+        return web.json_response(
+            {"kind": "Table", "columnDefinitions": [{"name": "Name"}], "rows": []}
+        )
+
+    async def func(api):
+        return await kubernetes.get_table(Namespace.objects(api))
+
+    table = asyncio.run(_with_api_server(handler, func))
+    assert table.columns == [{"name": "Name"}]
+
+
+def test_get_metadata_list(monkeypatch):
+    monkeypatch.setattr(kubernetes, "use_async_http", True)
+    requests = []
+
+    async def handler(request):
+        requests.append(request)
+        assert "as=PartialObjectMetadataList" in request.headers["Accept"]
+        return web.json_response(
+            {
+                "kind": "PartialObjectMetadataList",
+                "items": [{"metadata": {"name": "default"}}],
+            }
+        )
+
+    async def func(api):
+        query = Namespace.objects(api).filter(
+            field_selector={"metadata.name": "default"}
+        )
+        return await kubernetes.get_metadata_list(query)
+
+    assert asyncio.run(_with_api_server(handler, func)) == [{"name": "default"}]
+    assert requests[0].query["fieldSelector"] == "metadata.name=default"
+
+
+def test_response_raise_for_status():
+    response = async_http.Response("http://localhost/", 403, {}, b"{}")
+    assert not response.ok
+    try:
+        response.raise_for_status()
+    except Exception as e:
+        assert e.response.status_code == 403
+    else:
+        assert False, "expected HTTPError"
+
+
+def test_get_retries_after_token_refresh(monkeypatch):
+    monkeypatch.setattr(kubernetes, "use_async_http", True)
+    retries = []
+
+    async def handler(request):
+        if request.headers.get("Authorization") != "Bearer new-token":
+            return web.Response(status=401)
+        return web.json_response({"items": [{"metadata": {"name": "default"}}]})
+
+    def setup_request_auth(self, config, request, kwargs):
+        request.headers["Authorization"] = "Bearer expired-token"
+
+        def retry(send_kwargs):
+            # e.g. pykube's GCP auth provider refreshes the token and sends the request again
+            retries.append(send_kwargs)
+            request.headers["Authorization"] = "Bearer new-token"
+            return requests.get(
+                request.url, headers=request.headers, timeout=send_kwargs["timeout"]
+            )
+
+        return retry
+
+    monkeypatch.setattr(
+        async_http.KubernetesHTTPAdapter, "_setup_request_auth", setup_request_auth
+    )
+
+    async def func(api):
+        return await kubernetes.get_list(Namespace.objects(api))
+
+    namespaces = asyncio.run(_with_api_server(handler, func))
+    assert [ns.name for ns in namespaces] == ["default"]
+    assert len(retries) == 1
@@ -0,0 +1,72 @@
+import asyncio
+
+from kube_web import cache as cache_module
+from kube_web.cache import get_token_key
+from kube_web.cache import TTLCache
+
+
+def test_ttl_cache(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(cache_module.time, "monotonic", lambda: now[0])
+    calls = []
+
+    async def fetch():
+        calls.append(now[0])
+        return len(calls)
+
+    async def run():
+        cache = TTLCache(10, stale_ttl=20)
+        assert await cache.get("a", fetch) == 1
+        now[0] += 5
+        # fresh
+        assert await cache.get("a", fetch) == 1
+        now[0] += 10
+        # stale: return old value and refresh in the background
+        assert await cache.get("a", fetch) == 1
+        # keep a reference to the refresh task while it is running
+        assert len(cache._refresh_tasks) == 1
+        await asyncio.wait(set(cache._refresh_tasks))
+        assert not cache._refresh_tasks
+        assert await cache.get("a", fetch) == 2
+        now[0] += 100
+        # expired
+        assert await cache.get("a", fetch) == 3
+
+    asyncio.run(run())
+    assert len(calls) == 3
+
+
+def test_ttl_cache_max_size():
+    async def run():
+        cache = TTLCache(10, max_size=2)
+        for key in "abc":
+            await cache.get(key, lambda: asyncio.sleep(0, result=key))
+        return list(cache._entries.keys())
+
+    assert asyncio.run(run()) == ["b", "c"]
+
+
+def test_ttl_cache_refresh_error_does_not_log_key(monkeypatch, caplog):
+    now = [100.0]
+    monkeypatch.setattr(cache_module.time, "monotonic", lambda: now[0])
+
+    async def fail():
+        raise Exception("connection refused")
+
+    async def run():
+        cache = TTLCache(10, stale_ttl=20, name="namespaces")
+        key = ("c1", "secret-token")
+        assert await cache.get(key, lambda: asyncio.sleep(0, result=1)) == 1
+        now[0] += 15
+        assert await cache.get(key, fail) == 1
+        await asyncio.sleep(0)
+
+    asyncio.run(run())
+    assert "Failed to refresh namespaces cache entry" in caplog.text
+    assert "secret-token" not in caplog.text
+
+
+def test_get_token_key():
+    assert get_token_key(None) is None
+    assert "secret" not in get_token_key("secret")
+    assert get_token_key("secret") == get_token_key("secret")
@@ -0,0 +1,29 @@
+import os
+from unittest.mock import MagicMock
+
+from kube_web import cluster_discovery
+from kube_web.cluster_discovery import OAuth2BearerTokenAuth
+
+
+def test_oauth2_bearer_token_auth(monkeypatch, tmp_path):
+    now = [100.0]
+    monkeypatch.setattr(cluster_discovery.time, "monotonic", lambda: now[0])
+    token_path = tmp_path / "token"
+    token_path.write_text("token1\n")
+    auth = OAuth2BearerTokenAuth(token_path)
+
+    request = MagicMock(headers={})
+    auth(request)
+    assert request.headers["Authorization"] == "Bearer token1"
+
+    token_path.write_text("token2")
+    os.utime(token_path, ns=(0, 0))
+    # token file is not checked again within the check interval
+    assert auth.get_token() == "token1"
+    now[0] += OAuth2BearerTokenAuth.CHECK_INTERVAL_SECONDS
+    assert auth.get_token() == "token2"
+
+    # existing Authorization header is not overwritten
+    request = MagicMock(headers={"Authorization": "Bearer user"})
+    auth(request)
+    assert request.headers["Authorization"] == "Bearer user"
@@ -1,3 +1,8 @@
+import os
+from unittest.mock import MagicMock
+
+from kube_web.cluster_discovery import KubeconfigDiscoverer
+from kube_web.cluster_manager import ClusterManager
 from kube_web.cluster_manager import sanitize_cluster_name
 
 
@@ -6,3 +11,66 @@ def test_sanitize_cluster_name():
     assert sanitize_cluster_name("my-cluster") == "my-cluster"
     assert sanitize_cluster_name("a b") == "a:b"
     assert sanitize_cluster_name("https://srcco.de") == "https:::srcco.de"
+
+
+KUBECONFIG = """
+apiVersion: v1
+kind: Config
+clusters:
+- cluster: {{server: '{a}'}}
+  name: a
+- cluster: {{server: '{b}'}}
+  name: b
+contexts:
+- context: {{cluster: a, user: u}}
+  name: a
+- context: {{cluster: b, user: u}}
+  name: b
+current-context: a
+users:
+- name: u
+  user: {{token: secret}}
+"""
+
+
+def test_reload_keeps_unchanged_clusters(tmp_path):
+    path = tmp_path / "kubeconfig"
+    path.write_text(KUBECONFIG.format(a="https://a", b="https://b"))
+    cluster_manager = ClusterManager(KubeconfigDiscoverer(path, set()), {}, None, {})
+    clusters = {cluster.name: cluster for cluster in cluster_manager.clusters}
+    assert sorted(clusters.keys()) == ["a", "b"]
+
+    # file did not change
+    assert cluster_manager.clusters == list(clusters.values())
+
+    path.write_text(KUBECONFIG.format(a="https://a", b="https://b2"))
+    os.utime(path, ns=(0, 0))
+    new_clusters = {cluster.name: cluster for cluster in cluster_manager.clusters}
+    assert new_clusters["a"] is clusters["a"]
+    assert new_clusters["b"] is not clusters["b"]
+    assert new_clusters["b"].api.url == "https://b2"
+    # the resource registry is kept (discovery is expensive)
+    assert new_clusters["b"].resource_registry is clusters["b"].resource_registry
+    assert new_clusters["b"].resource_registry.api is new_clusters["b"].api
+
+
+def test_reload_interval():
+    discoverer = MagicMock()
+    discoverer.get_clusters.return_value = []
+    cluster_manager = ClusterManager(discoverer, {}, None, {}, reload_interval=60)
+    cluster_manager.clusters
+    cluster_manager.clusters
+    assert discoverer.get_clusters.call_count == 1
+
+
+def test_connect_timeout(tmp_path):
+    path = tmp_path / "kubeconfig"
+    path.write_text(KUBECONFIG.format(a="https://a", b="https://b"))
+    cluster_manager = ClusterManager(
+        KubeconfigDiscoverer(path, set()), {}, None, {}, connect_timeout=2
+    )
+    for cluster in cluster_manager.clusters:
+        # (connect, read) timeout as supported by requests
+        assert cluster.api.timeout == (2, 10)
+    cluster_manager.reload()
+    assert cluster_manager.get("a").api.timeout == (2, 10)
@@ -0,0 +1,106 @@
+import asyncio
+from unittest.mock import MagicMock
+
+import pykube
+from pykube import Pod
+from pykube.query import Table
+
+from kube_web import kubernetes
+from kube_web.informer import Informer
+from kube_web.informer import InformerCache
+from kube_web.informer import parse_simple_selector
+
+
+def test_parse_simple_selector():
+    assert parse_simple_selector(pykube.query.everything) == {}
+    assert parse_simple_selector("app=foo") == {"app": "foo"}
+    assert parse_simple_selector("app=foo,env!=prod") == {
+        "app": "foo",
+        "env!": ["prod"],
+    }
+    assert parse_simple_selector({"app": "foo"}) == {"app": "foo"}
+    # set-based selectors are not supported in memory
+    assert parse_simple_selector("env in (prod,test)") is None
+    assert parse_simple_selector("app") is None
+    assert parse_simple_selector({"app__in": ["a"]}) is None
+
+
+def _pod_row(namespace, name, labels):
+    return {
+        "cells": [name, "Running"],
+        "object": {
+            "metadata": {"namespace": namespace, "name": name, "labels": labels}
+        },
+    }
+
+
+def test_informer_cache_get_table(monkeypatch):
+    async def get_table(query, params=None):
+        return Table(Pod, {"kind": "Table", "metadata": {"continue": "next"}})
+
+    monkeypatch.setattr(kubernetes, "get_table", get_table)
+
+    async def run():
+        api = MagicMock()
+        cache = InformerCache("c1", api, frozenset(["pods"]))
+        informer = Informer("c1", api, Pod)
+        informer.columns = [{"name": "Name"}, {"name": "Status"}]
+        # rows added by WATCH events are at the end
+        for row in (
+            _pod_row("kube-system", "c", {"app": "foo"}),
+            _pod_row("default", "b", {"app": "bar"}),
+            _pod_row("default", "a", {"app": "foo"}),
+        ):
+            metadata = row["object"]["metadata"]
+            informer.rows[(metadata["namespace"], metadata["name"])] = row
+        informer.synced.set()
+        cache._informers[(Pod.version, Pod.endpoint)] = informer
+
+        query = Pod.objects(api).filter(namespace="default", selector="app=foo")
+        table = await cache.get_table(query)
+        assert [row["cells"][0] for row in table.rows] == ["a"]
+
+        query = Pod.objects(api).filter(namespace=pykube.all, selector="app=foo")
+        table = await cache.get_table(query)
+        assert [row["cells"][0] for row in table.rows] == ["a", "c"]
+
+        # modifying the returned table must not change the cache
+        table.rows[0]["cells"].append("x")
+        table.columns[0]["class"] = "num"
+        assert informer.rows[("default", "a")]["cells"] == ["a", "Running"]
+        assert informer.columns[0] == {"name": "Name"}
+
+        # pagination is done by the API server
+        table = await cache.get_table(
+            Pod.objects(api).filter(namespace=pykube.all), {"limit": 2}
+        )
+        assert table.obj["metadata"] == {"continue": "next"}
+
+        objects = await cache.get_list(Pod.objects(api).filter(namespace="default"))
+        assert [obj.name for obj in objects] == ["a", "b"]
+
+    asyncio.run(run())
+
+
+def test_informer_cache_does_not_wait_for_sync(monkeypatch):
+    listed = asyncio.Event()
+
+    async def get_table(query, params=None):
+        if params.get("includeObject"):
+            # the informer's initial LIST is slow
+            listed.set()
+            await asyncio.sleep(10)
+        return Table(Pod, {"kind": "Table", "rows": [_pod_row("default", "a", {})]})
+
+    monkeypatch.setattr(kubernetes, "get_table", get_table)
+
+    async def run():
+        cache = InformerCache("c1", MagicMock(), frozenset(["pods"]))
+        query = Pod.objects(cache.api).filter(namespace="default")
+        table = await asyncio.wait_for(cache.get_table(query, {}), 1)
+        assert [row["cells"][0] for row in table.rows] == ["a"]
+        # the informer was started in the background
+        await asyncio.wait_for(listed.wait(), 1)
+        cache.stop()
+
+    asyncio.run(run())
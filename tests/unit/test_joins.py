@@ -1,4 +1,18 @@
+import asyncio
+from unittest.mock import MagicMock
+
+from pykube import Node
+from pykube import Pod
+from pykube import Secret
+from pykube.query import Table
+
+from kube_web import kubernetes
 from kube_web.joins import generate_name_from_spec
+from kube_web.joins import join_custom_columns
+from kube_web.joins import join_metrics
+from kube_web.joins import parse_custom_columns
+from kube_web.joins import SECRET_CONTENT_HIDDEN
+from kube_web.kubernetes import PodMetrics
 
 
 def test_generate_name_from_spec():
@@ -11,3 +25,194 @@ def test_generate_name_from_spec():
         generate_name_from_spec('metadata.annotations."foo"')
         == "Metadata Annotations Foo"
     )
+
+
+def test_join_custom_columns_with_full_objects():
+    table = Table(
+        Pod,
+        {
+            "kind": "Table",
+            "columnDefinitions": [{"name": "Name"}],
+            "rows": [
+                {
+                    "cells": ["a"],
+                    "object": {
+                        "kind": "Pod",
+                        "metadata": {"name": "a", "namespace": "default"},
+                        "spec": {"containers": [{"image": "foo:1"}]},
+                    },
+                }
+            ],
+        },
+    )
+    cluster = MagicMock()
+
+    asyncio.run(
+        join_custom_columns(
+            lambda q: q,
+            cluster,
+            table,
+            "default",
+            False,
+            "Images=spec.containers[*].image",
+            {},
+            MagicMock(),
+        )
+    )
+    assert table.rows[0]["cells"] == ["a", ["foo:1"]]
+    # no second LIST call
+    cluster.informer_cache.get_list.assert_not_called()
+
+
+def test_join_custom_columns_secret_hidden():
+    table = Table(
+        Secret,
+        {
+            "kind": "Table",
+            "columnDefinitions": [{"name": "Name"}],
+            "rows": [
+                {
+                    "cells": ["a"],
+                    "object": {
+                        "kind": "Secret",
+                        "metadata": {"name": "a", "namespace": "default"},
+                        "data": {"password": "c2VjcmV0"},
+                    },
+                }
+            ],
+        },
+    )
+
+    asyncio.run(
+        join_custom_columns(
+            lambda q: q,
+            MagicMock(),
+            table,
+            "default",
+            False,
+            "Password=data.password;Name=metadata.name",
+            {},
+            MagicMock(show_secrets=False),
+        )
+    )
+    assert table.rows[0]["cells"] == ["a", SECRET_CONTENT_HIDDEN, SECRET_CONTENT_HIDDEN]
+
+
+def test_join_nodes_cached():
+    def pod_table():
+        return Table(
+            Pod,
+            {
+                "kind": "Table",
+                "columnDefinitions": [{"name": "Name"}],
+                "rows": [
+                    {
+                        "cells": ["a"],
+                        "object": {
+                            "kind": "Pod",
+                            "metadata": {"name": "a", "namespace": "default"},
+                            "spec": {"nodeName": "n1"},
+                        },
+                    }
+                ],
+            },
+        )
+
+    cluster = MagicMock()
+    cluster.name = "test-join-nodes"
+    # no --cluster-auth-use-session-token
+    cluster.api.access_token = None
+
+    async def get_list(query):
+        return [Node(None, {"metadata": {"name": "n1", "labels": {"zone": "z1"}}})]
+
+    cluster.informer_cache.get_list = MagicMock(side_effect=get_list)
+
+    async def run():
+        tables = []
+        for i in range(2):
+            table = pod_table()
+            await join_custom_columns(
+                lambda q: q,
+                cluster,
+                table,
+                "default",
+                False,
+                "Zone=node.metadata.labels.zone",
+                {"join": "nodes"},
+                MagicMock(),
+            )
+            tables.append(table)
+        return tables
+
+    for table in asyncio.run(run()):
+        assert table.rows[0]["cells"] == ["a", "z1"]
+    assert cluster.informer_cache.get_list.call_count == 1
+
+
+def test_parse_custom_columns():
+    columns = parse_custom_columns("Images=spec.containers[*].image;metadata.name")
+    assert [name for name, _ in columns] == ["Images", "Metadata Name"]
+    assert columns[1][1].search({"metadata": {"name": "a"}}) == "a"
+    # compiled expressions are cached
+    assert (
+        parse_custom_columns("Images=spec.containers[*].image;metadata.name") is columns
+    )
+
+
+def test_join_metrics_cached(monkeypatch):
+    calls = []
+
+    async def get_list(query):
+        calls.append(query)
+        return [
+            PodMetrics(
+                None,
+                {
+                    "metadata": {"name": "a", "namespace": "default"},
+                    "containers": [
+                        {"usage": {"cpu": "500m", "memory": "1Mi"}},
+                        {"usage": {"cpu": "250m", "memory": "1Mi"}},
+                    ],
+                },
+            )
+        ]
+
+    monkeypatch.setattr(kubernetes, "get_list", get_list)
+    cluster = MagicMock()
+    cluster.name = "test-join-metrics"
+    # no --cluster-auth-use-session-token
+    cluster.api.access_token = None
+
+    async def run():
+        tables = []
+        for i in range(2):
+            table = Table(
+                Pod,
+                {
+                    "kind": "Table",
+                    "columnDefinitions": [{"name": "Name"}],
+                    "rows": [
+                        {
+                            "cells": ["a"],
+                            "object": {
+                                "metadata": {"name": "a", "namespace": "default"}
+                            },
+                        },
+                        {
+                            "cells": ["b"],
+                            "object": {
+                                "metadata": {"name": "b", "namespace": "default"}
+                            },
+                        },
+                    ],
+                },
+            )
+            await join_metrics(lambda q: q, cluster, table, "default", False, {})
+            tables.append(table)
+        return tables
+
+    for table in asyncio.run(run()):
+        assert table.rows[0]["cells"] == ["a", 0.75, 2 * 1024 ** 2]
+        assert table.rows[1]["cells"] == ["b", 0, 0]
+    assert len(calls) == 1
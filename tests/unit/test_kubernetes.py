@@ -1,5 +1,132 @@
+import asyncio
+from unittest.mock import MagicMock
+
+from pykube import Pod
+from pykube.query import Table
+
+from kube_web import kubernetes
 from kube_web.kubernetes import parse_resource
 
 
 def test_parse_resource():
     assert parse_resource("500m") == 0.5
+    assert parse_resource("2") == 2
+    assert parse_resource("1500000n") == 0.0015
+    assert parse_resource("2Gi") == 2 * 1024 ** 3
+    assert parse_resource("100M") == 100 * 1000 ** 2
+
+
+def test_get_table_single_flight(monkeypatch):
+    calls = []
+
+    async def fetch_table(query, params=None):
+        calls.append(query)
+        await asyncio.sleep(0.01)
+        return Table(
+            Pod, {"kind": "Table", "columnDefinitions": [], "rows": [{"cells": ["a"]}]},
+        )
+
+    monkeypatch.setattr(kubernetes, "_fetch_table", fetch_table)
+
+    async def run():
+        api = MagicMock()
+        query = Pod.objects(api).filter(namespace="default")
+        tables = await asyncio.gather(
+            kubernetes.get_table(query), kubernetes.get_table(query)
+        )
+        # different namespace => separate API call
+        await kubernetes.get_table(query.filter(namespace="kube-system"))
+        return tables
+
+    table1, table2 = asyncio.run(run())
+    assert len(calls) == 2
+    # every caller gets its own copy
+    table1.rows[0]["cells"].append("b")
+    assert table2.rows[0]["cells"] == ["a"]
+
+
+def test_iter_table_chunks(monkeypatch):
+    pages = {None: ("a", "c1"), "c1": ("b", "c2"), "c2": ("c", None)}
+    calls = []
+
+    async def get_table(query, params=None):
+        calls.append(dict(params))
+        name, continue_token = pages[params.get("continue")]
+        return Table(
+            Pod,
+            {
+                "kind": "Table",
+                "metadata": {"continue": continue_token},
+                "columnDefinitions": [],
+                "rows": [{"cells": [name]}],
+            },
+        )
+
+    monkeypatch.setattr(kubernetes, "get_table", get_table)
+
+    async def run():
+        query = Pod.objects(MagicMock()).filter(namespace="default")
+        return [
+            table.rows[0]["cells"][0]
+            async for table in kubernetes.iter_table_chunks(query, chunk_size=1)
+        ]
+
+    assert asyncio.run(run()) == ["a", "b", "c"]
+    assert calls == [
+        {"limit": 1},
+        {"limit": 1, "continue": "c1"},
+        {"limit": 1, "continue": "c2"},
+    ]
+
+
+def test_get_table_cancel_on_deadline(monkeypatch):
+    cancelled = []
+
+    async def fetch_table(query, params=None):
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.append(query)
+            raise
+
+    monkeypatch.setattr(kubernetes, "_fetch_table", fetch_table)
+
+    async def run():
+        query = Pod.objects(MagicMock()).filter(namespace="default")
+        try:
+            await asyncio.wait_for(kubernetes.get_table(query), 0.01)
+        except asyncio.TimeoutError:
+            pass
+        await asyncio.sleep(0)
+
+    asyncio.run(run())
+    # nobody waits for the result anymore
+    assert len(cancelled) == 1
+    assert not kubernetes._in_flight
+
+
+def test_get_table_call_again_after_cancel(monkeypatch):
+    calls = []
+
+    async def fetch_table(query, params=None):
+        calls.append(query)
+        await asyncio.sleep(0.05)
+        return Table(Pod, {"kind": "Table", "columnDefinitions": [], "rows": []})
+
+    monkeypatch.setattr(kubernetes, "_fetch_table", fetch_table)
+
+    async def run():
+        query = Pod.objects(MagicMock()).filter(namespace="default")
+        task = asyncio.create_task(kubernetes.get_table(query))
+        await asyncio.sleep(0.01)
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+        # immediately call again (before the cancelled call is done)
+        return await kubernetes.get_table(query)
+
+    table = asyncio.run(run())
+    assert table.rows == []
+    assert len(calls) == 2
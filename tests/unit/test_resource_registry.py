@@ -0,0 +1,169 @@
+import asyncio
+from unittest.mock import MagicMock
+
+from pykube.objects import NamespacedAPIObject
+
+from kube_web import resource_registry
+from kube_web.resource_registry import cluster_object_factory
+from kube_web.resource_registry import namespaced_object_factory
+from kube_web.resource_registry import ResourceRegistry
+from kube_web.resource_registry import ResourceTypeNotFound
+
+
+def test_api_discovery_cache(monkeypatch, tmp_path):
+    discovered = [
+        namespaced_object_factory("Deployment", "deployments", "apps/v1"),
+        cluster_object_factory("Node", "nodes", "v1"),
+    ]
+
+    async def get_namespaced_resource_types(api, failed_group_versions=None):
+        for clazz in discovered:
+            yield clazz
+
+    monkeypatch.setattr(
+        resource_registry,
+        "get_namespaced_resource_types",
+        get_namespaced_resource_types,
+    )
+    api = MagicMock()
+    api.url = "https://kube-1.example.org"
+
+    async def run():
+        registry = ResourceRegistry(api, {}, tmp_path)
+        await registry.initialize()
+        assert registry.cache_file.exists()
+
+        # a new registry (e.g. after restart) loads the cache file
+        discovered.append(namespaced_object_factory("MyCRD", "mycrds", "foo/v1"))
+        registry = ResourceRegistry(api, {}, tmp_path)
+        await registry.initialize()
+        clazz = await registry.get_class_by_plural_name("deployments", namespaced=True)
+        assert issubclass(clazz, NamespacedAPIObject)
+        assert clazz.version == "apps/v1"
+        assert (
+            await registry.get_class_by_plural_name(
+                "mycrds", namespaced=True, default=None
+            )
+            is None
+        )
+        # let the background revalidation finish
+        await registry._revalidate_task
+        clazz = await registry.get_class_by_plural_name("mycrds", namespaced=True)
+        assert clazz.kind == "MyCRD"
+
+    asyncio.run(run())
+
+
+def test_get_class_by_plural_name():
+    registry = ResourceRegistry(MagicMock(), {"ingresses": "networking.k8s.io/v1"})
+    registry._set_resource_types(
+        [
+            namespaced_object_factory("Ingress", "ingresses", "extensions/v1beta1"),
+            namespaced_object_factory("Ingress", "ingresses", "networking.k8s.io/v1"),
+            cluster_object_factory("Node", "nodes", "v1"),
+        ]
+    )
+
+    async def run():
+        clazz = await registry.get_class_by_plural_name("ingresses", namespaced=True)
+        assert clazz.version == "networking.k8s.io/v1"
+        clazz = await registry.get_class_by_plural_name(
+            "ingresses", namespaced=True, api_version="extensions/v1beta1"
+        )
+        assert clazz.version == "extensions/v1beta1"
+        clazz = await registry.get_class_by_plural_name("nodes", namespaced=None)
+        assert clazz.kind == "Node"
+        assert (
+            await registry.get_class_by_plural_name(
+                "nodes", namespaced=True, default=None
+            )
+            is None
+        )
+        try:
+            await registry.get_class_by_plural_name("foos", namespaced=None)
+        except ResourceTypeNotFound as e:
+            assert str(e) == "Resource type 'foos' not found"
+        else:
+            assert False
+        clazz = await registry.get_class_by_api_version_kind(
+            "v1", "Node", namespaced=False
+        )
+        assert clazz.endpoint == "nodes"
+
+    asyncio.run(run())
+
+
+def test_refresh_periodically(monkeypatch):
+    discovered = [cluster_object_factory("Node", "nodes", "v1")]
+
+    async def get_namespaced_resource_types(api, failed_group_versions=None):
+        for clazz in discovered:
+            yield clazz
+
+    monkeypatch.setattr(
+        resource_registry,
+        "get_namespaced_resource_types",
+        get_namespaced_resource_types,
+    )
+
+    async def run():
+        registry = ResourceRegistry(MagicMock(), {}, refresh_interval=0.01)
+        await registry.initialize()
+        assert (
+            await registry.get_class_by_plural_name(
+                "mycrds", namespaced=True, default=None
+            )
+            is None
+        )
+        discovered.append(namespaced_object_factory("MyCRD", "mycrds", "foo/v1"))
+        await asyncio.sleep(0.05)
+        clazz = await registry.get_class_by_plural_name("mycrds", namespaced=True)
+        registry.stop()
+        return clazz
+
+    assert asyncio.run(run()).kind == "MyCRD"
+
+
+def test_refresh_keeps_failed_api_groups(monkeypatch):
+    responses = {
+        "v1": {"resources": [{"name": "pods", "namespaced": True, "kind": "Pod"}]},
+        "/apis": {
+            "groups": [
+                {
+                    "preferredVersion": {"groupVersion": "metrics.k8s.io/v1beta1"},
+                    "versions": [{"groupVersion": "metrics.k8s.io/v1beta1"}],
+                }
+            ]
+        },
+        "metrics.k8s.io/v1beta1": {
+            "resources": [{"name": "pods", "namespaced": True, "kind": "PodMetrics"}]
+        },
+    }
+    for data in responses.values():
+        for resource in data.get("resources", []):
+            resource["verbs"] = ["get", "list"]
+    unavailable = set()
+
+    async def api_get(api, version):
+        if version in unavailable:
+            raise Exception("503 Service Unavailable")
+        response = MagicMock()
+        response.json.return_value = responses[version]
+        return response
+
+    monkeypatch.setattr(resource_registry.kubernetes, "api_get", api_get)
+
+    async def run():
+        registry = ResourceRegistry(MagicMock(), {})
+        await registry.discover()
+        # the aggregated API is temporarily not available
+        unavailable.add("metrics.k8s.io/v1beta1")
+        await registry.discover()
+        clazz = await registry.get_class_by_plural_name(
+            "pods", namespaced=True, api_version="metrics.k8s.io/v1beta1"
+        )
+        assert clazz.kind == "PodMetrics"
+        clazz = await registry.get_class_by_plural_name("pods", namespaced=True)
+        assert clazz.kind == "Pod"
+
+    asyncio.run(run())
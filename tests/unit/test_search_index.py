@@ -0,0 +1,103 @@
+import asyncio
+from unittest.mock import MagicMock
+
+from pykube import Deployment
+from pykube.query import Table
+
+from kube_web.search_index import get_trigrams
+from kube_web.search_index import IndexedResourceType
+from kube_web.search_index import SearchIndex
+
+
+def _table(rows):
+    return Table(
+        Deployment,
+        {
+            "kind": "Table",
+            "columnDefinitions": [{"name": "Name"}, {"name": "Images"}],
+            "rows": [
+                {
+                    "cells": [name, image],
+                    "object": {
+                        "metadata": {
+                            "name": name,
+                            "namespace": namespace,
+                            "labels": labels,
+                            "creationTimestamp": "2020-01-01T00:00:00Z",
+                        }
+                    },
+                }
+                for namespace, name, image, labels in rows
+            ],
+        },
+    )
+
+
+ROWS = [
+    ("default", "my-app", "nginx:1.19", {"app": "my-app", "team": "foo"}),
+    ("default", "other", "redis", {"app": "other"}),
+    ("kube-system", "my-proxy", "envoy proxy", {"team": "bar"}),
+]
+
+
+def test_get_trigrams():
+    assert get_trigrams("nginx") == {"ngi", "gin", "inx"}
+    assert get_trigrams("ab") == set()
+
+
+def test_indexed_resource_type_search():
+    indexed = IndexedResourceType(Deployment, _table(ROWS))
+
+    def names(selector, filter_query, namespace=None):
+        return [
+            doc["name"] for doc in indexed.search(selector, filter_query, namespace)
+        ]
+
+    assert names({}, "my") == ["my-app", "my-proxy"]
+    assert names({}, "inx:1") == ["my-app"]
+    # shorter than a trigram
+    assert names({}, "y-") == ["my-app", "my-proxy"]
+    assert indexed.get_candidates("xyz") == set()
+    assert names({}, "my", "default") == ["my-app"]
+    assert names({"team": "foo"}, "") == ["my-app"]
+    # label values are matched, but not label keys
+    assert names({}, "bar") == ["my-proxy"]
+    assert names({}, "team") == []
+    # text with spaces must be found in one cell
+    assert names({}, "envoy proxy") == ["my-proxy"]
+    assert names({}, "proxy envoy") == []
+    # label column is shown in the search result
+    assert indexed.documents[0]["cells"] == [
+        "my-app",
+        "app=my-app,team=foo",
+        "nginx:1.19",
+    ]
+
+
+def test_search_index_refresh():
+    cluster = MagicMock()
+    cluster.name = "c1"
+
+    async def get_class_by_plural_name(plural, namespaced):
+        return Deployment
+
+    async def get_table(query):
+        return _table(ROWS)
+
+    cluster.resource_registry.get_class_by_plural_name = get_class_by_plural_name
+    cluster.informer_cache.get_table = get_table
+    cluster_manager = MagicMock(clusters=[cluster])
+
+    def is_row_allowed(row, api_obj_class):
+        return row["object"]["metadata"]["namespace"] != "kube-system"
+
+    search_index = SearchIndex(cluster_manager, ["deployments"], 60, 10, is_row_allowed)
+    asyncio.run(search_index.refresh())
+    indexed = search_index.get("c1", "deployments")
+    assert [doc["name"] for doc in indexed.documents] == ["my-app", "other"]
+    assert search_index.get("c1", "services") is None
+
+    # cluster was removed
+    cluster_manager.clusters = []
+    asyncio.run(search_index.refresh())
+    assert search_index.get("c1", "deployments") is None
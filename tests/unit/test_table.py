@@ -9,6 +9,7 @@ from kube_web.table import add_label_columns
 from kube_web.table import filter_table
 from kube_web.table import filter_table_by_predicate
 from kube_web.table import merge_cluster_tables
+from kube_web.table import merge_sorted_cluster_tables
 from kube_web.table import remove_columns
 from kube_web.table import sort_table
 
@@ -172,6 +173,13 @@ def test_filter_table_text_match_case_insensitive2(single_pod_table):
     assert len(table.rows) == 1
 
 
+def test_filter_table_text_no_match_across_cells(single_pod_table):
+    table = single_pod_table
+    # "myname" + "ImagePullBackOff": text must match within one cell
+    filter_table(table, "nameimage")
+    assert len(table.rows) == 0
+
+
 def test_filter_table_text_no_match(single_pod_table):
     table = single_pod_table
     filter_table(table, "othername")
@@ -364,3 +372,48 @@ def test_marge_cluster_tables_performance(capsys):
 
     with capsys.disabled():
         print("merge_cluster_tables", timeit.timeit(merge_tables, number=1000))
+
+
+def test_merge_sorted_cluster_tables():
+    def table(cluster, names):
+        return Table(
+            Pod,
+            {
+                "kind": "Table",
+                "columnDefinitions": [{"name": "Name"}],
+                "rows": [{"cells": [name]} for name in names],
+                "clusters": [cluster],
+            },
+        )
+
+    tables = [table("c1", ["a", "d", "e"]), table("c2", ["b", "c"]), table("c3", [])]
+    merged = merge_sorted_cluster_tables(tables, "Name")
+    assert [row["cells"][0] for row in merged.rows] == ["a", "b", "c", "d", "e"]
+    assert merged.obj["clusters"] == ["c1", "c2", "c3"]
+
+    tables = [table("c1", ["e", "d", "a"]), table("c2", ["c", "b"])]
+    merged = merge_sorted_cluster_tables(tables, "Name:desc", limit=3)
+    assert [row["cells"][0] for row in merged.rows] == ["e", "d", "c"]
+
+    # without sorting, the limit applies per cluster (rows are only concatenated)
+    tables = [table("c1", ["a", "d"]), table("c2", ["b", "c"])]
+    merged = merge_sorted_cluster_tables(tables, None, limit=3)
+    assert [row["cells"][0] for row in merged.rows] == ["a", "d", "b", "c"]
+
+
+def test_sort_table_limit():
+    table = Table(
+        Pod,
+        {
+            "kind": "Table",
+            "columnDefinitions": [{"name": "Name"}, {"name": "Memory"}],
+            "rows": [
+                {"cells": [name, memory]}
+                for name, memory in [("a", 3), ("b", 1), ("c", 3), ("d", 2)]
+            ],
+        },
+    )
+    sort_table(table, "Memory:desc", limit=2)
+    assert [row["cells"][0] for row in table.rows] == ["c", "a"]
+    sort_table(table, "Memory", limit=1)
+    assert [row["cells"][0] for row in table.rows] == ["a"]
@@ -1,6 +1,27 @@
+import asyncio
 import re
+from unittest.mock import MagicMock
 
+import requests
+from aiohttp.test_utils import TestClient
+from aiohttp.test_utils import TestServer
+from pykube import Deployment
+from pykube.query import Table
+
+from kube_web import kubernetes
+from kube_web.informer import Informer
+from kube_web.informer import InformerCache
+from kube_web.main import parse_args
+from kube_web.web import CLUSTER_MANAGER
+from kube_web.web import CONFIG
+from kube_web.web import get_app
+from kube_web.web import get_search_matches
 from kube_web.web import is_allowed_namespace
+from kube_web.web import parse_search_query
+from kube_web.web import plan_search_namespace
+from kube_web.web import prewarm_resource_registries
+from kube_web.web import PREWARM_STATUS
+from kube_web.web import rank_search_results
 
 
 def test_is_allowed_namespace():
@@ -11,3 +32,338 @@ def test_is_allowed_namespace():
     assert not is_allowed_namespace("a", [], [re.compile("a")])
 
     assert not is_allowed_namespace("default-foo", [re.compile("default")], [])
+
+
+def test_prewarm_resource_registries():
+    initialized = []
+
+    class ResourceRegistry:
+        def __init__(self, name, delay):
+            self.name = name
+            self.delay = delay
+
+        async def initialize(self):
+            await asyncio.sleep(self.delay)
+            initialized.append(self.name)
+
+    clusters = [
+        MagicMock(resource_registry=ResourceRegistry("a", 0)),
+        MagicMock(resource_registry=ResourceRegistry("slow", 10)),
+        MagicMock(resource_registry=ResourceRegistry("b", 0)),
+    ]
+    app = {
+        CONFIG: MagicMock(prewarm_concurrency=2, prewarm_timeout=0.05),
+        CLUSTER_MANAGER: MagicMock(clusters=clusters),
+        PREWARM_STATUS: {"ready": False},
+    }
+    asyncio.run(prewarm_resource_registries(app))
+    assert sorted(initialized) == ["a", "b"]
+    assert app[PREWARM_STATUS]["ready"]
+
+
+def test_get_search_matches():
+    cells = ["my-nginx-deployment", 3, "app=nginx"]
+    matches = get_search_matches(cells, "NGINX")
+    assert matches == [("my-", "nginx", "-deployment"), ("app=", "nginx", "")]
+    assert (
+        get_search_matches(cells, "nginx", [str(c).lower() for c in cells]) == matches
+    )
+
+
+def test_rank_search_results():
+    ranked = []
+    keys = []
+
+    def result(title):
+        return {"title": title, "kind": "Deployment", "link": f"/{title}", "labels": {}}
+
+    positions = rank_search_results(ranked, keys, [result("b"), result("d")], "x")
+    assert [(i, r["title"]) for i, r in positions] == [(0, "b"), (1, "d")]
+    positions = rank_search_results(
+        ranked, keys, [result("c"), result("a"), result("x")], "x"
+    )
+    # exact title match is ranked first
+    assert [(i, r["title"]) for i, r in positions] == [(1, "c"), (0, "a"), (0, "x")]
+    assert [r["title"] for r in ranked] == ["x", "a", "b", "c", "d"]
+
+
+def test_parse_search_query():
+    assert parse_search_query("nginx") == ("", {}, "nginx")
+    assert parse_search_query("app=foo metadata.name=bar team=x") == (
+        "app=foo,team=x",
+        {"metadata.name": "bar"},
+        "",
+    )
+
+
+def test_plan_search_namespace():
+    field_selector = {"metadata.namespace": "default"}
+    # cluster-scoped objects never match a namespace field selector
+    assert plan_search_namespace(False, field_selector, "", True) == (None, False)
+    assert plan_search_namespace(False, {}, "", True) == (None, True)
+    assert plan_search_namespace(True, field_selector, "", True) == ("default", True)
+    assert plan_search_namespace(True, field_selector, "other", False) == (
+        "default",
+        False,
+    )
+    assert plan_search_namespace(True, {}, "other", False) == ("other", True)
+
+
+def _deployment_table(names):
+    return Table(
+        Deployment,
+        {
+            "kind": "Table",
+            "columnDefinitions": [{"name": "Name"}],
+            "rows": [
+                {
+                    "cells": [name],
+                    "object": {
+                        "metadata": {
+                            "name": name,
+                            "namespace": "default",
+                            "creationTimestamp": "2020-01-01T00:00:00Z",
+                        }
+                    },
+                }
+                for name in names
+            ],
+        },
+    )
+
+
+def _mock_cluster(name, delay=0, names=("my-app",)):
+    cluster = MagicMock()
+    cluster.name = name
+    cluster.labels = {}
+
+    async def get_class_by_plural_name(
+        plural, namespaced, default=None, api_version=None
+    ):
+        return Deployment
+
+    async def get_table(query, params=None):
+        await asyncio.sleep(delay)
+        return _deployment_table(names)
+
+    async def get_list(query):
+        await asyncio.sleep(delay)
+        return []
+
+    cluster.resource_registry.get_class_by_plural_name = get_class_by_plural_name
+    cluster.informer_cache.get_table = get_table
+    cluster.informer_cache.get_list = get_list
+    return cluster
+
+
+def _get(clusters, args, url):
+    """Return status and text of GET request to the app with the given (mocked) clusters."""
+    cluster_manager = MagicMock(clusters=clusters)
+    cluster_manager.get.side_effect = {c.name: c for c in clusters}.get
+
+    async def run():
+        app = get_app(cluster_manager, parse_args(args))
+        async with TestClient(TestServer(app)) as client:
+            response = await client.get(url)
+            return response.status, await response.text()
+
+    return asyncio.run(run())
+
+
+def _get_concurrently(clusters, args, urls):
+    """Return texts of concurrent GET requests to the app with the given (mocked) clusters."""
+    cluster_manager = MagicMock(clusters=clusters)
+    cluster_manager.get.side_effect = {c.name: c for c in clusters}.get
+
+    async def run():
+        app = get_app(cluster_manager, parse_args(args))
+        async with TestClient(TestServer(app)) as client:
+            responses = await asyncio.gather(*[client.get(url) for url in urls])
+            return [await response.text() for response in responses]
+
+    return asyncio.run(run())
+
+
+def test_search_events_cluster_timeout_starts_after_semaphore():
+    # the second search has to wait for the first one (max concurrency),
+    # but both clusters respond within the timeout
+    clusters = [_mock_cluster("c1", 0.3), _mock_cluster("c2", 0.3)]
+    status, text = _get(
+        clusters,
+        ["--search-max-concurrency=1", "--cluster-timeout=0.5"],
+        "/search/events?q=my&type=deployments",
+    )
+    assert status == 200
+    assert text.count("event: results") == 2
+    assert "event: errors" not in text
+    assert "event: done" in text
+
+
+def test_search_events_cluster_timeout():
+    clusters = [_mock_cluster("c1"), _mock_cluster("slow", 5)]
+    status, text = _get(
+        clusters, ["--cluster-timeout=0.2"], "/search/events?q=my&type=deployments",
+    )
+    assert text.count("event: results") == 1
+    assert "Cluster slow did not respond within 0.2 seconds" in text
+
+
+def test_resource_list_cluster_timeout():
+    clusters = [_mock_cluster("c1"), _mock_cluster("slow", 5)]
+    # the fast cluster's rows are shown together with an error for the slow one
+    status, text = _get(
+        clusters,
+        ["--cluster-timeout=0.2"],
+        "/clusters/_all/namespaces/_all/deployments",
+    )
+    assert status == 200
+    assert "/clusters/c1/namespaces/default/deployments/my-app" in text
+    assert "Cluster slow did not respond within 0.2 seconds" in text
+
+    status, text = _get(
+        clusters,
+        ["--cluster-timeout=0.2"],
+        "/clusters/slow/namespaces/_all/deployments",
+    )
+    assert status == 504
+
+
+def test_cluster_page_timeout():
+    clusters = [_mock_cluster("slow", 5)]
+    status, text = _get(clusters, ["--cluster-timeout=0.2"], "/clusters/slow")
+    assert status == 504
+    assert "Cluster slow did not respond within 0.2 seconds" in text
+
+
+def test_resource_list_pagination(monkeypatch):
+    pages = {None: (["a", "b"], "token1"), "token1": (["c"], None)}
+    calls = []
+
+    async def get_table(query, params=None):
+        calls.append(dict(params))
+        names, continue_token = pages[params.get("continue")]
+        table = _deployment_table(names)
+        table.obj["metadata"] = {"continue": continue_token}
+        return table
+
+    async def get_list(query):
+        return []
+
+    monkeypatch.setattr(kubernetes, "get_table", get_table)
+    monkeypatch.setattr(kubernetes, "get_list", get_list)
+
+    cluster = _mock_cluster("c1")
+    # the informer must not serve paginated lists
+    cluster.informer_cache = InformerCache(
+        "c1", cluster.api, frozenset(["deployments"])
+    )
+    informer = Informer("c1", cluster.api, Deployment)
+    informer.columns = [{"name": "Name"}]
+    for row in _deployment_table(["x", "y", "z"]).rows:
+        informer.rows[("default", row["cells"][0])] = row
+    informer.synced.set()
+    cluster.informer_cache._informers[
+        (Deployment.version, Deployment.endpoint)
+    ] = informer
+    url = "/clusters/c1/namespaces/_all/deployments?limit=2"
+    status, text = _get([cluster], [], url)
+    assert status == 200
+    assert "/deployments/a" in text and "/deployments/c" not in text
+    assert "limit=2&amp;continue=token1" in text
+    assert "Next page" in text
+
+    status, text = _get([cluster], [], url + "&continue=token1")
+    assert "/deployments/c" in text and "/deployments/a" not in text
+    assert "Next page" not in text
+    assert "First page" in text
+    assert calls == [{"limit": 2}, {"limit": 2, "continue": "token1"}]
+
+
+def test_resource_list_pagination_with_failing_cluster():
+    cluster = _mock_cluster("c1", names=["a", "b"])
+
+    async def get_table(query, params=None):
+        table = _deployment_table(["a", "b"])
+        table.obj["metadata"] = {"continue": "token1"}
+        return table
+
+    cluster.informer_cache.get_table = get_table
+    failing_cluster = _mock_cluster("failing")
+
+    async def fail(query, params=None):
+        raise Exception("connection refused")
+
+    failing_cluster.informer_cache.get_table = fail
+    status, text = _get(
+        [cluster, failing_cluster],
+        [],
+        "/clusters/_all/namespaces/_all/deployments?limit=2",
+    )
+    assert status == 200
+    assert "/deployments/a" in text
+    assert "connection refused" in text
+    # the continue token of one cluster cannot be used for the multi-cluster view
+    assert "Next page" not in text
+
+
+def _chunked_cluster(chunks, gone_after=None):
+    cluster = _mock_cluster("c1", names=["full-a", "full-b", "other"])
+
+    async def iter_table_chunks(query, chunk_size):
+        for i, names in enumerate(chunks):
+            if i == gone_after:
+                response = MagicMock(status_code=410)
+                raise requests.exceptions.HTTPError("410 Gone", response=response)
+            yield _deployment_table(names)
+
+    cluster.informer_cache.iter_table_chunks = iter_table_chunks
+    return cluster
+
+
+def _row_names(text):
+    return re.findall(r"/clusters/c1/namespaces/default/deployments/([\w-]+)", text)
+
+
+def test_resource_list_filter_in_chunks():
+    cluster = _chunked_cluster([["a1", "x"], ["b", "a2"], ["a3"]])
+    url = "/clusters/c1/namespaces/_all/deployments?filter=a&sort=Name:desc"
+    status, text = _get([cluster], [], url)
+    assert status == 200
+    assert _row_names(text) == ["a3", "a2", "a1"]
+
+    # without sorting, the first matching rows are enough
+    status, text = _get([cluster], [], url.replace("sort=Name:desc", "limit=2"))
+    assert _row_names(text) == ["a1", "a2"]
+
+
+def test_resource_list_filter_in_chunks_expired_continue_token():
+    cluster = _chunked_cluster([["a1", "x"], ["a2"]], gone_after=1)
+    url = "/clusters/c1/namespaces/_all/deployments?filter=full"
+    status, text = _get([cluster], [], url)
+    assert status == 200
+    # falls back to a full LIST
+    assert _row_names(text) == ["full-a", "full-b"]
+
+
+def test_resource_list_filter_in_chunks_concurrently(monkeypatch):
+    pages = {None: (["a1", "b1"], "token1"), "token1": (["b2"], None)}
+
+    async def fetch_table(query, params=None):
+        # concurrent requests for the same chunk share one API call (single flight)
+        await asyncio.sleep(0.1)
+        names, continue_token = pages[params.get("continue")]
+        table = _deployment_table(names)
+        table.obj["metadata"] = {"continue": continue_token}
+        return table
+
+    monkeypatch.setattr(kubernetes, "_fetch_table", fetch_table)
+    cluster = _mock_cluster("c1")
+    cluster.informer_cache.iter_table_chunks = lambda query, chunk_size: (
+        kubernetes.iter_table_chunks(query, chunk_size=chunk_size)
+    )
+    url = "/clusters/c1/namespaces/_all/deployments"
+    texts = _get_concurrently(
+        [cluster], [], [url + "?filter=a&limit=1", url + "?filter=b"]
+    )
+    assert _row_names(texts[0]) == ["a1"]
+    assert _row_names(texts[1]) == ["b1", "b2"]